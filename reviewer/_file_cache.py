@@ -0,0 +1,76 @@
+# SPDX-License-Identifier: Apache-2.0
+# SPDX-FileCopyrightText: Copyright contributors to the vLLM-Omni project
+
+"""On-disk cache of repo file contents that survives server restarts."""
+
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from reviewer.github import REPO
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    key TEXT PRIMARY KEY,
+    ref TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    content TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS files_fetched_at ON files (fetched_at)
+"""
+
+# Rows kept; past this the oldest fetches are dropped. Files at a commit SHA
+# never go stale, so without a cap every reviewed revision would pile up.
+_MAX_ROWS = 2000
+
+
+def _key(path: str, ref: str) -> str:
+    return hashlib.sha256(f"{REPO}|{path}|{ref}".encode()).hexdigest()
+
+
+class FileCache:
+    """sqlite-backed (path, ref) -> contents store.
+
+    Freshness policy is left to the caller; entries only record when they
+    were fetched (wall-clock, so it stays meaningful across restarts).
+    At most ``max_rows`` entries are kept, oldest fetch evicted first.
+    """
+
+    def __init__(self, db_path: Path, max_rows: int = _MAX_ROWS):
+        self._max_rows = max_rows
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        # One connection shared by the server's worker threads, serialized by a lock
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.executescript(_SCHEMA)
+
+    def get(self, path: str, ref: str) -> tuple[str, float] | None:
+        """Return (content, fetched_at) for a cached file, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT content, fetched_at FROM files WHERE key = ?", (_key(path, ref),)
+            ).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def put(self, path: str, ref: str, content: str) -> None:
+        """Store a freshly fetched file."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO files (key, ref, fetched_at, content) VALUES (?, ?, ?, ?)",
+                (_key(path, ref), ref, time.time(), content),
+            )
+            self._conn.execute(
+                "DELETE FROM files WHERE key IN "
+                "(SELECT key FROM files ORDER BY fetched_at DESC LIMIT -1 OFFSET ?)",
+                (self._max_rows,),
+            )
+
+    def clear(self) -> None:
+        """Drop every cached file."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM files")
@@ -0,0 +1,102 @@
+# SPDX-License-Identifier: Apache-2.0
+# SPDX-FileCopyrightText: Copyright contributors to the vLLM-Omni project
+
+"""Diff fingerprints of saved reviews, for spotting repeat or near-duplicate PRs."""
+
+from __future__ import annotations
+
+import hashlib
+import heapq
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+# Hashes kept per fingerprint. Bounds storage and comparison cost regardless
+# of diff size; the similarity estimate is within a few percent at this size.
+_SKETCH_SIZE = 128
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS reviews (
+    pr_number INTEGER PRIMARY KEY,
+    title TEXT NOT NULL,
+    sketch TEXT NOT NULL,
+    saved_at REAL NOT NULL
+)
+"""
+
+
+def diff_fingerprint(diff: str) -> list[int]:
+    """Bottom-k sketch of a diff's changed lines.
+
+    Every added/removed line (sign kept, whitespace stripped) is hashed once
+    and only the smallest hashes are kept. Two sketches are enough to
+    estimate the Jaccard similarity of the full line sets, see similarity().
+    File headers (``--- a/...``, ``+++ b/...``) are not changed lines and
+    are skipped, so two edits to the same file don't match on those alone.
+    """
+    hashes = set()
+    in_header = False  # Between "diff --git" and the file's first hunk
+    for line in diff.split("\n"):
+        sign = line[:1]
+        if sign == "d" and line.startswith("diff --git"):
+            in_header = True
+        elif sign == "@" and line.startswith("@@"):
+            in_header = False
+        elif in_header:
+            continue
+        elif sign == "+" or sign == "-":
+            text = line[1:].strip()
+            if text:
+                digest = hashlib.blake2b(f"{sign}{text}".encode(), digest_size=8).digest()
+                hashes.add(int.from_bytes(digest, "big"))
+    return heapq.nsmallest(_SKETCH_SIZE, hashes)
+
+
+def similarity(a: list[int], b: list[int]) -> float:
+    """Estimated Jaccard similarity (0-1) of the diffs behind two fingerprints."""
+    if not a or not b:
+        return 0.0
+    set_a, set_b = set(a), set(b)
+    # The smallest hashes of the union are a uniform sample of it; a sampled
+    # hash is in either diff exactly when it is in that diff's sketch
+    sample = heapq.nsmallest(_SKETCH_SIZE, set_a | set_b)
+    shared = sum(1 for h in sample if h in set_a and h in set_b)
+    return shared / len(sample)
+
+
+class ReviewIndex:
+    """sqlite-backed pr_number -> (title, diff fingerprint) of saved reviews."""
+
+    def __init__(self, db_path: Path):
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        # One connection shared by the server's worker threads, serialized by a lock
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(_SCHEMA)
+
+    def put(self, pr_number: int, title: str, sketch: list[int]) -> None:
+        """Record (or replace) the fingerprint of a PR's saved review."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO reviews (pr_number, title, sketch, saved_at) VALUES (?, ?, ?, ?)",
+                (pr_number, title, json.dumps(sketch), time.time()),
+            )
+
+    def most_similar(self, sketch: list[int]) -> tuple[int, str, float] | None:
+        """Return (pr_number, title, similarity) of the closest saved review, or None."""
+        with self._lock:
+            rows = self._conn.execute("SELECT pr_number, title, sketch FROM reviews").fetchall()
+        best = None
+        for pr_number, title, stored in rows:
+            score = similarity(sketch, json.loads(stored))
+            if best is None or score > best[2]:
+                best = (pr_number, title, score)
+        return best
+
+    def clear(self) -> None:
+        """Drop every fingerprint."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM reviews")
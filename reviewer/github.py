@@ -1,57 +1,422 @@
 # SPDX-License-Identifier: Apache-2.0
 # SPDX-FileCopyrightText: Copyright contributors to the vLLM-Omni project
 
-"""GitHub API client for vllm-project/vllm-omni using gh CLI."""
+"""GitHub API client for vllm-project/vllm-omni (httpx + gh CLI)."""
 
 from __future__ import annotations
 
-import json
+import atexit
+import functools
+import os
+import random
 import re
 import subprocess
-from urllib.parse import quote
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Any, Callable, Iterator
+
+import httpx
+
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+except ImportError:  # optional speedup, see the "fast" extra
+    import json
+
+    _json_loads = json.loads
+
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode()
+
+try:
+    import h2  # noqa: F401  (httpx's HTTP/2 backend, from the http2 extra)
+
+    _HTTP2 = True
+except ImportError:  # plain httpx install; stay on pooled HTTP/1.1
+    _HTTP2 = False
 
 REPO = "vllm-project/vllm-omni"
+BASE = "https://api.github.com"
 DIFF_CHAR_LIMIT = 200_000
+_DIFF_CHUNK_SIZE = 65_536
+# Per-file share of a diff parsed for inline comments, for files nobody
+# reviews line by line; the rest of such a file is skipped. Hand-written
+# code is always parsed in full (DIFF_CHAR_LIMIT still bounds the diff).
+_DIFF_FILE_CHAR_LIMIT = 50_000
+_GENERATED_FILE_RE = re.compile(
+    r"(?:\.lock|(?:^|/)package-lock\.json|(?:^|/)pnpm-lock\.yaml|\.min\.(?:js|css)"
+    r"|_pb2(?:_grpc)?\.pyi?|\.snap|\.svg|\.ipynb)$"
+)
+
+# Max concurrent lookups when resolving refs linked from a PR body
+_LINKED_REF_WORKERS = 10
+# Aliased refs per GraphQL query (GitHub's node limit allows far more, but
+# keeps each query's cost and size modest)
+_REFS_PER_QUERY = 100
+
+# Max concurrent comment posts; kept low because GitHub's secondary rate
+# limit is much stricter for content-creating requests than for reads
+_INLINE_POST_WORKERS = 4
+
+# Max GET responses kept in memory. Within _RESPONSE_TTL seconds a cached
+# body is reused outright; after that it is revalidated with its ETag or Last-Modified
+# (304s don't count against the rate limit).
+_RESPONSE_CACHE_SIZE = 512
+_RESPONSE_TTL = 60.0
+
+# Retry policy for reads: transient 5xx, 429, and rate-limited 403s
+_RETRY_STATUSES = frozenset({429, 502, 503, 504})
+_MAX_RETRIES = 5
+_MAX_RETRY_WAIT = 60.0  # give up rather than block a tool call for longer
+
+# Budget assumed for a token/bucket with no rate-limit headers seen yet
+_FRESH_BUDGET = 5_000
+
+# REST paths below are relative to BASE; repo-scoped ones start with this prefix
+_REPO_PATH = f"/repos/{REPO}"
+_REPO_OWNER, _REPO_NAME = REPO.split("/")
+
+# Fields fetched per linked issue/PR when batching refs through GraphQL
+_REF_FRAGMENT = """
+fragment RefFields on IssueOrPullRequest {
+  __typename
+  ... on Issue { title body state author { login } }
+  ... on PullRequest { title body state author { login } }
+}
+"""
+
+# Recent PR listing with only the fields list_recent_prs returns
+_RECENT_PRS_QUERY = """
+query($owner: String!, $name: String!, $n: Int!, $states: [PullRequestState!], $field: IssueOrderField!) {
+  repository(owner: $owner, name: $name) {
+    pullRequests(first: $n, states: $states, orderBy: {field: $field, direction: DESC}) {
+      nodes {
+        number title state createdAt updatedAt
+        author { login }
+        labels(first: 20) { nodes { name } }
+      }
+    }
+  }
+}
+"""
+
+# REST state filter -> GraphQL states (None = all); REST "closed" includes merged
+_GRAPHQL_PR_STATES = {"open": ["OPEN"], "closed": ["CLOSED", "MERGED"], "all": None}
+
+# Seconds a list_recent_prs result is reused before re-querying
+_RECENT_PRS_TTL = 30.0
+
+# How long a resolved issue/PR ref is reused before it is looked up again
+_REF_TTL = 300.0
+
+# Changed-file paths for a PR, without the per-file patch text REST returns
+_PR_FILES_QUERY = """
+query($owner: String!, $name: String!, $number: Int!, $cursor: String) {
+  repository(owner: $owner, name: $name) {
+    pullRequest(number: $number) {
+      files(first: 100, after: $cursor) {
+        nodes { path }
+        pageInfo { hasNextPage endCursor }
+      }
+    }
+  }
+}
+"""
+
+# Everything fetch_pr reports except the diff, in one round trip. GraphQL has
+# no patch text, so the diff still comes from REST (in parallel).
+_PR_QUERY = """
+query($owner: String!, $name: String!, $number: Int!) {
+  repository(owner: $owner, name: $name) {
+    pullRequest(number: $number) {
+      number title body state baseRefName headRefName headRefOid
+      author { __typename login }
+      labels(first: 100) { nodes { name } }
+      files(first: 100) { nodes { path } pageInfo { hasNextPage } }
+      comments(first: 100) { nodes { author { __typename login } body } }
+      reviews(first: 100) {
+        nodes {
+          author { __typename login } state body
+          comments(first: 100) { nodes { author { __typename login } path body } }
+        }
+      }
+    }
+  }
+}
+"""
+
+# Linked refs in PR bodies: full issue/PR URLs (group 1) or bare #123 (group 2)
+_REF_RE = re.compile(
+    r"https?://github\.com/[\w\-]+/[\w\-]+/(?:issues|pull)/(\d+)|(?<!\w)#(\d+)"
+)
+
+# New-file start line from a hunk header: "@@ -a,b +c,d @@"
+_HUNK_RE = re.compile(r"^@@ .*?\+(\d+)")
+
+# An added/removed diff line holding a Python import, matched across a whole
+# file's diff at once. Groups: sign, stripped statement, from-module,
+# import-module. [^\S\n] is whitespace that can't run onto the next line.
+# Anchoring on a literal "\n" rather than ^ lets the engine jump between
+# line starts instead of trying every position; a file section always
+# begins at the newline ending its header.
+_DIFF_IMPORT_RE = re.compile(
+    r"\n([+-])[^\S\n]*("
+    r"(?:from[^\S\n]+([\w.]+)[^\S\n]+import|import[^\S\n]+([\w.]+)).*?"
+    r")[^\S\n]*$",
+    re.MULTILINE,
+)
+
+# "diff --git a/path b/path" file headers (callers check for a line start)
+_DIFF_HEADER_RE = re.compile(r"diff --git [^\n]*")
+
+
+def _diff_git_path(line: str) -> str | None:
+    """New-side path from a "diff --git a/old b/new" line.
+
+    Exact when old == new, spaces included; otherwise a whitespace split,
+    which the file's "+++ b/" header (_plus_header_path) should override.
+    """
+    rest = line[11:]
+    half = (len(rest) + 1) // 2
+    if rest[:2] == "a/" and rest[half:half + 2] == "b/" and rest[2:half - 1] == rest[half + 2:]:
+        return rest[half + 2:]
+    parts = line.split()
+    return parts[3][2:] if len(parts) >= 4 else None
+
+
+def _plus_header_path(line: str) -> str:
+    """Path from a "+++ b/path" header line; git tab-terminates paths with spaces."""
+    return line[6:].split("\t", 1)[0]
+
+# PR type prefixes - normalized type name -> bracketed alternatives, in
+# priority order (the first listed type wins in extract_pr_type)
+_PR_TYPE_PREFIXES = (
+    ("bugfix", "Bugfix|BugFix|Bug Fix|Bug"),
+    ("feature", "Feat|Feature"),
+    ("model", "Model|New Reward Model"),
+    ("quantization", "Quantization"),
+    ("documentation", "Doc"),
+    ("ci", "CI|CI/Build|Test"),
+    ("platform", "NPU|XPU|ROCM"),
+    ("performance", "Performance"),
+    ("api", "API|Frontend"),
+    ("refactor", "Refactor|Chore|Misc"),
+    ("wip", "WIP|DO NOT MERGE THIS"),
+)
+_PR_TYPE_ORDER = {name: i for i, (name, _) in enumerate(_PR_TYPE_PREFIXES)}
+
+# Every prefix in one alternation, so a title is scanned once; the named
+# group that matched (m.lastgroup) is the normalized type.
+_PR_TYPE_RE = re.compile(
+    "|".join(rf"\[(?P<{name}>{alts})\]" for name, alts in _PR_TYPE_PREFIXES),
+    re.IGNORECASE,
+)
+# Bound once; the classifiers run per title in listing/triage loops
+_find_pr_types = _PR_TYPE_RE.finditer
+_pr_type_rank = _PR_TYPE_ORDER.__getitem__
+
+# Search-keyword extraction (_extract_keywords)
+_QUOTED_RE = re.compile(r'["\']([^"\']+)["\']')
+_CAMEL_CASE_RE = re.compile(r"\b[A-Z][a-z]+(?:[A-Z][a-z]+)+\b")
+_SNAKE_CASE_RE = re.compile(r"\b[a-z]+(?:_[a-z]+)+\b")
+_HYPHENATED_RE = re.compile(r"\b[a-z]+(?:-[a-z]+)+\b")
+_TITLE_WORD_RE = re.compile(r"\b[a-zA-Z]{4,}\b")
+
+# PR references in commit messages: "#1471", "PR #1471", "Fixes #123"
+_COMMIT_PR_REF_RE = re.compile(r"(?:PR\s*)?#(\d{3,})|(?:Fixes|Closes)\s+#(\d{3,})", re.IGNORECASE)
+
+
+def _login(actor: dict | None) -> str:
+    """REST-style login for a GraphQL actor ("ghost" if deleted, "[bot]" suffix for apps)."""
+    if not actor:
+        return "ghost"
+    return f"{actor['login']}[bot]" if actor.get("__typename") == "Bot" else actor["login"]
+
+
+def _validator(resp: httpx.Response) -> tuple[str, str] | None:
+    """The conditional-request header that revalidates a response: its ETag, else Last-Modified."""
+    if etag := resp.headers.get("ETag"):
+        return ("If-None-Match", etag)
+    if modified := resp.headers.get("Last-Modified"):
+        return ("If-Modified-Since", modified)
+    return None
+
 
-# Patterns for linked refs in PR bodies
-_REF_PATTERNS = [
-    re.compile(r"(?:https?://github\.com/[\w\-]+/[\w\-]+/(?:issues|pull)/(\d+))"),
-    re.compile(r"(?<!\w)#(\d+)"),
-]
-
-# PR type patterns - maps regex patterns to normalized type names
-_PR_TYPE_PATTERNS = [
-    (re.compile(r"\[(?:Bugfix|BugFix|Bug Fix|Bug)\]", re.IGNORECASE), "bugfix"),
-    (re.compile(r"\[(?:Feat|Feature)\]", re.IGNORECASE), "feature"),
-    (re.compile(r"\[(?:Model|New Reward Model)\]", re.IGNORECASE), "model"),
-    (re.compile(r"\[Quantization\]", re.IGNORECASE), "quantization"),
-    (re.compile(r"\[Doc\]", re.IGNORECASE), "documentation"),
-    (re.compile(r"\[(?:CI|CI/Build|Test)\]", re.IGNORECASE), "ci"),
-    (re.compile(r"\[(?:NPU|XPU|ROCM)\]", re.IGNORECASE), "platform"),
-    (re.compile(r"\[Performance\]", re.IGNORECASE), "performance"),
-    (re.compile(r"\[(?:API|Frontend)\]", re.IGNORECASE), "api"),
-    (re.compile(r"\[(?:Refactor|Chore|Misc)\]", re.IGNORECASE), "refactor"),
-    (re.compile(r"\[(?:WIP|DO NOT MERGE THIS)\]", re.IGNORECASE), "wip"),
-]
-
-
-def _run_gh_api(endpoint: str, *args: str, paginate: bool = False) -> dict | list:
-    """Run gh api command and return parsed JSON result."""
-    cmd = ["gh", "api", endpoint] + list(args)
-    if paginate:
-        cmd.append("--paginate")
-    result = subprocess.run(cmd, capture_output=True, text=True)
-    if result.returncode != 0:
-        raise RuntimeError(f"gh api failed: {result.stderr.strip()}")
-    return json.loads(result.stdout)
-
-
-def _run_gh(*args: str) -> str:
-    """Run gh command and return stdout."""
-    result = subprocess.run(["gh"] + list(args), capture_output=True, text=True)
-    if result.returncode != 0:
-        raise RuntimeError(f"gh command failed: {result.stderr.strip()}")
-    return result.stdout
+def _json_body(payload: Any) -> dict:
+    """Request kwargs sending ``payload`` as JSON, encoded by _json_dumps."""
+    return {"content": _json_dumps(payload), "headers": {"Content-Type": "application/json"}}
+
+
+def _parse_json(resp: httpx.Response) -> Any:
+    """Decode a JSON response body straight from its raw bytes."""
+    return _json_loads(resp.content)
+
+
+def _iter_lines(text: str):
+    """Yield the lines of text lazily; same pieces as ``text.split("\\n")``."""
+    find = text.find
+    start = 0
+    while True:
+        end = find("\n", start)
+        if end < 0:
+            yield text[start:]
+            return
+        yield text[start:end]
+        start = end + 1
+
+
+def _is_retryable(resp: httpx.Response) -> bool:
+    """Whether a response is a transient failure or a rate limit worth retrying."""
+    if resp.status_code in _RETRY_STATUSES:
+        return True
+    # Primary limit: remaining == 0; secondary limit: Retry-After on a 403
+    return resp.status_code == 403 and (
+        resp.headers.get("X-RateLimit-Remaining") == "0" or "Retry-After" in resp.headers
+    )
+
+
+class TransientAPIError(RuntimeError):
+    """A GitHub error that may clear on its own: 5xx or a rate limit (see _is_retryable)."""
+
+
+def _retry_delay(resp: httpx.Response, attempt: int) -> float:
+    """Seconds to wait before retrying: GitHub's hint if present, else exponential."""
+    retry_after = resp.headers.get("Retry-After", "0")
+    delay = float(retry_after) if retry_after.isdigit() else 0.0
+    reset = resp.headers.get("X-RateLimit-Reset")
+    if resp.headers.get("X-RateLimit-Remaining") == "0" and reset and reset.isdigit():
+        delay = max(delay, int(reset) - time.time())
+    if delay <= 0:
+        delay = float(2 ** attempt)  # 1s, 2s, 4s, 8s, 16s
+    return delay + random.uniform(0, 0.5)
+
+
+@functools.lru_cache(maxsize=None)
+def _shared_http_client(token: str | None) -> httpx.Client:
+    """Return the process-wide pooled client for a token.
+
+    Every GitHubClient built with the same token reuses one connection pool,
+    so TLS/HTTP-2 sessions stay warm across reviews.
+    """
+    headers = {
+        "Accept": "application/vnd.github+json",
+        "X-GitHub-Api-Version": "2022-11-28",
+    }
+    if token:
+        headers["Authorization"] = f"Bearer {token}"
+    # HTTP/2 lets concurrent fetch_pr / linked-ref calls share one pooled connection
+    client = httpx.Client(
+        base_url=BASE,
+        headers=headers,
+        timeout=30,
+        http2=_HTTP2,
+        limits=httpx.Limits(max_keepalive_connections=10, max_connections=20),
+    )
+    atexit.register(client.close)
+    return client
+
+
+def _read_gh_hosts_token() -> str | None:
+    """Read the github.com ``oauth_token`` gh stored in its hosts.yml, if any.
+
+    gh writes a small fixed-shape YAML file, so a line scan is enough and
+    avoids a YAML dependency. Newer gh versions keep the token in the
+    system keyring instead; then there is nothing to find here.
+    """
+    config_dir = os.environ.get("GH_CONFIG_DIR") or os.path.join(
+        os.environ.get("XDG_CONFIG_HOME") or os.path.expanduser("~/.config"), "gh"
+    )
+    try:
+        with open(os.path.join(config_dir, "hosts.yml"), encoding="utf-8") as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return None
+
+    in_host = False
+    child_indent = None
+    for line in lines:
+        stripped = line.strip()
+        if not stripped or stripped.startswith("#"):
+            continue
+        indent = len(line) - len(line.lstrip())
+        if indent == 0:
+            in_host = stripped == "github.com:"
+            child_indent = None
+            continue
+        if not in_host:
+            continue
+        # Only the host's own key counts, not the per-user copies nested deeper
+        if child_indent is None:
+            child_indent = indent
+        if indent == child_indent and stripped.startswith("oauth_token:"):
+            return stripped.split(":", 1)[1].strip().strip("\"'") or None
+    return None
+
+
+@functools.lru_cache(maxsize=1)
+def _resolve_tokens() -> tuple[str, ...]:
+    """Resolve GitHub tokens once per process.
+
+    GITHUB_TOKENS (comma-separated pool) and GITHUB_TOKEN are checked first
+    so CI never forks ``gh``, then gh's own hosts.yml. ``gh auth token`` is
+    only run when gh keeps its token in the system keyring.
+    """
+    pool = tuple(t.strip() for t in os.environ.get("GITHUB_TOKENS", "").split(",") if t.strip())
+    if pool:
+        return pool
+    # GH_TOKEN is what ``gh auth token`` itself would report first
+    token = os.environ.get("GITHUB_TOKEN") or os.environ.get("GH_TOKEN") or _read_gh_hosts_token()
+    if token:
+        return (token,)
+    try:
+        result = subprocess.run(["gh", "auth", "token"], capture_output=True, text=True)
+    except FileNotFoundError:
+        return ()
+    if result.returncode == 0 and result.stdout.strip():
+        return (result.stdout.strip(),)
+    return ()
+
+
+def _rate_resource(path: str) -> str:
+    """GitHub rate-limit bucket (X-RateLimit-Resource) a request path is charged to."""
+    if path.startswith("/graphql"):
+        return "graphql"
+    if path.startswith("/search/code"):
+        return "code_search"
+    if path.startswith("/search"):
+        return "search"
+    return "core"
+
+
+class _TokenBudget:
+    """A pooled client plus the last rate-limit state seen for its token."""
+
+    __slots__ = ("client", "limits")
+
+    def __init__(self, client: httpx.Client):
+        self.client = client
+        # resource -> (remaining, reset epoch seconds)
+        self.limits: dict[str, tuple[int, float]] = {}
+
+    def record(self, resp: httpx.Response) -> None:
+        remaining = resp.headers.get("X-RateLimit-Remaining", "")
+        if not remaining.isdigit():
+            return
+        reset = resp.headers.get("X-RateLimit-Reset", "")
+        resource = resp.headers.get("X-RateLimit-Resource", "core")
+        self.limits[resource] = (int(remaining), float(reset) if reset.isdigit() else 0.0)
+
+    def remaining(self, resource: str, now: float) -> int:
+        """Known budget for a bucket; unseen or already-reset buckets count as fresh."""
+        if resource not in self.limits:
+            return _FRESH_BUDGET
+        remaining, reset_at = self.limits[resource]
+        return _FRESH_BUDGET if reset_at and reset_at <= now else remaining
 
 
 def extract_pr_type(title: str) -> str | None:
@@ -65,30 +430,183 @@ def extract_pr_type(title: str) -> str | None:
         "[Quantization] FP8 for VAE" -> "quantization"
         "Fix typo" -> None
     """
-    for pattern, type_name in _PR_TYPE_PATTERNS:
-        if pattern.search(title):
-            return type_name
-    return None
+    types = detect_pr_types(title)
+    return types[0][0] if types else None
 
 
-def detect_pr_types(title: str) -> list[tuple[str, str]]:
+@functools.lru_cache(maxsize=1024)
+def detect_pr_types(title: str) -> tuple[tuple[str, str], ...]:
     """Detect all PR types in title (supports multiple types).
 
-    Returns list of (normalized_type, matched_prefix) tuples.
+    Returns (normalized_type, matched_prefix) pairs in priority order.
+    Results are memoized per title, so they come back as immutable tuples.
 
     Examples:
-        "[Bugfix][NPU] Fix crash" -> [("bugfix", "[Bugfix]"), ("platform", "[NPU]")]
+        "[Bugfix][NPU] Fix crash" -> (("bugfix", "[Bugfix]"), ("platform", "[NPU]"))
     """
-    results = []
-    for pattern, type_name in _PR_TYPE_PATTERNS:
-        match = pattern.search(title)
-        if match:
-            results.append((type_name, match.group(0)))
-    return results
+    if "[" not in title:  # every prefix is bracketed
+        return ()
+    found: dict[str, str] = {}
+    for match in _find_pr_types(title):
+        found.setdefault(match.lastgroup, match.group(0))
+    return tuple((name, found[name]) for name in sorted(found, key=_pr_type_rank))
 
 
 class GitHubClient:
-    """GitHub API client using gh CLI for authentication."""
+    """GitHub REST client over httpx, authenticated via gh CLI or GITHUB_TOKEN(S).
+
+    Given several tokens, reads go to whichever token has the most
+    rate-limit budget left; writes always use the first token so reviews
+    are posted under one identity.
+    """
+
+    def __init__(self, token: str | list[str] | None = None):
+        if not token:
+            tokens = _resolve_tokens()
+        elif isinstance(token, str):
+            tokens = (token,)
+        else:
+            tokens = tuple(token)
+        self._budgets = [_TokenBudget(_shared_http_client(t)) for t in tokens or (None,)]
+        self._authenticated = bool(tokens)
+        self._recent_prs_cache: dict[tuple, tuple[float, list[dict]]] = {}
+        # issue/PR number -> (monotonic fetch time, resolved ref or None if missing)
+        self._ref_cache: dict[int, tuple[float, dict | None]] = {}
+        # key -> (revalidation header or None, parsed body, monotonic fetch time)
+        self._response_cache: OrderedDict[tuple, tuple[tuple[str, str] | None, Any, float]] = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+    def _pick_budget(self, resource: str) -> _TokenBudget:
+        """Pick the pooled token with the most budget left for a bucket."""
+        if len(self._budgets) == 1:
+            return self._budgets[0]
+        now = time.time()
+        return max(self._budgets, key=lambda b: b.remaining(resource, now))
+
+    def _send(self, method: str, path: str, **kwargs: Any) -> httpx.Response:
+        """Send a request, retrying rate limits and transient errors with backoff."""
+        resource = _rate_resource(path)
+        attempt = 0
+        while True:
+            budget = self._pick_budget(resource)
+            resp = budget.client.request(method, path, **kwargs)
+            budget.record(resp)
+
+            if attempt >= _MAX_RETRIES or not _is_retryable(resp):
+                return resp
+            # An exhausted token hands the retry straight to another pooled one
+            if resp.headers.get("X-RateLimit-Remaining") == "0" and self._pick_budget(resource) is not budget:
+                attempt += 1
+                continue
+            delay = _retry_delay(resp, attempt)
+            if delay > _MAX_RETRY_WAIT:
+                return resp
+            time.sleep(delay)
+            attempt += 1
+
+    def _get(self, path: str, params: dict | None = None) -> dict | list:
+        """GET a REST endpoint (path relative to BASE) and return parsed JSON."""
+        return self._conditional_get(path, params, parse=_parse_json)
+
+    def _get_list(self, path: str, params: dict | None = None) -> list:
+        """GET an endpoint expected to return a JSON array; [] for any other shape."""
+        data = self._get(path, params)
+        return data if isinstance(data, list) else []
+
+    def _conditional_get(
+        self,
+        path: str,
+        params: dict | None = None,
+        accept: str | None = None,
+        parse: Callable[[httpx.Response], Any] = _parse_json,
+    ) -> Any:
+        """GET through the in-memory response cache.
+
+        A body fetched within _RESPONSE_TTL is returned without a request.
+        Older entries are revalidated with ``If-None-Match`` (or
+        ``If-Modified-Since`` when GitHub sent no ETag), and a 304 reuses
+        the cached body.
+        """
+        key = (path, accept, tuple(sorted((params or {}).items())))
+        cached = self._cache_lookup(key)
+        if cached and time.monotonic() - cached[2] < _RESPONSE_TTL:
+            return cached[1]
+
+        headers = {"Accept": accept} if accept else {}
+        if cached and cached[0]:
+            name, value = cached[0]
+            headers[name] = value
+
+        resp = self._send("GET", path, params=params, headers=headers)
+        if resp.status_code == 304 and cached:
+            self._cache_store(key, cached[0], cached[1])
+            return cached[1]
+        if resp.is_error:
+            # Still an error after _send's retries; the subclass lets callers
+            # tell "try again later" from "doesn't exist / not allowed"
+            error = TransientAPIError if _is_retryable(resp) or resp.status_code >= 500 else RuntimeError
+            raise error(f"GET {path} failed: HTTP {resp.status_code} {resp.text[:200]}")
+
+        body = parse(resp)
+        self._cache_store(key, _validator(resp), body)
+        return body
+
+    def _cache_lookup(self, key: tuple) -> tuple[tuple[str, str] | None, Any, float] | None:
+        """Return a cached (validator, body, fetched_at) entry, marking it recently used."""
+        with self._cache_lock:
+            cached = self._response_cache.get(key)
+            if cached:
+                self._response_cache.move_to_end(key)
+            return cached
+
+    def _cache_store(self, key: tuple, validator: tuple[str, str] | None, body: Any) -> None:
+        """Store a fresh response body, evicting the least recently used entries."""
+        with self._cache_lock:
+            self._response_cache[key] = (validator, body, time.monotonic())
+            self._response_cache.move_to_end(key)
+            while len(self._response_cache) > _RESPONSE_CACHE_SIZE:
+                self._response_cache.popitem(last=False)
+
+    def _expire_cache(self) -> None:
+        """Force revalidation of every cached response (kept for their validators).
+
+        Called after writes so a re-fetch right after posting sees new comments.
+        """
+        with self._cache_lock:
+            for key, (validator, body, _) in self._response_cache.items():
+                self._response_cache[key] = (validator, body, 0.0)
+
+    def clear_cache(self) -> None:
+        """Forget every cached response, resolved ref and PR listing."""
+        with self._cache_lock:
+            self._response_cache.clear()
+        self._ref_cache.clear()
+        self._recent_prs_cache.clear()
+
+    def _post(self, path: str, payload: dict) -> dict:
+        """POST a JSON payload to a REST endpoint and return the parsed response."""
+        primary = self._budgets[0]
+        resp = primary.client.post(path, **_json_body(payload))
+        primary.record(resp)
+        if resp.is_error:
+            raise RuntimeError(f"POST {path} failed: HTTP {resp.status_code} {resp.text[:200]}")
+        self._expire_cache()
+        return _parse_json(resp)
+
+    def _graphql(self, query: str, variables: dict | None = None) -> dict:
+        """Run a GraphQL query and return its ``data`` payload."""
+        if not self._authenticated:
+            raise RuntimeError("GitHub GraphQL API requires a token")
+        # Queries are read-only, so they share the GET retry policy
+        resp = self._send("POST", "/graphql", **_json_body({"query": query, "variables": variables or {}}))
+        if resp.is_error:
+            raise RuntimeError(f"GraphQL query failed: HTTP {resp.status_code} {resp.text[:200]}")
+        payload = _parse_json(resp)
+        # Unresolvable numbers come back as null fields plus "errors"; only a
+        # missing data payload means the query as a whole failed.
+        if payload.get("data") is None:
+            raise RuntimeError(f"GraphQL query failed: {payload.get('errors')}")
+        return payload["data"]
 
     # -- Keyword extraction for related context -------------------------
 
@@ -109,29 +627,25 @@ class GitHubClient:
 
         Returns max 5 unique keywords.
         """
-        import re
         keywords = set()
 
         # 1. Remove PR type prefixes from title
-        clean_title = title
-        for pattern, _ in _PR_TYPE_PATTERNS:
-            clean_title = pattern.sub("", clean_title)
-        clean_title = clean_title.strip()
+        clean_title = _PR_TYPE_RE.sub("", title).strip()
 
         # 2. Extract quoted identifiers (e.g., "transformers 5.x", 'num_cached_tokens')
-        for match in re.finditer(r'["\']([^"\']+)["\']', f"{clean_title} {body[:500]}"):
+        for match in _QUOTED_RE.finditer(f"{clean_title} {body[:500]}"):
             kw = match.group(1).strip()
             if len(kw) > 2 and kw.lower() not in self._KEYWORD_STOP_WORDS:
                 keywords.add(kw)
 
         # 3. Extract technical terms from title (CamelCase, snake_case, hyphenated)
-        for term in re.findall(r'\b[A-Z][a-z]+(?:[A-Z][a-z]+)+\b', clean_title):  # CamelCase
+        for term in _CAMEL_CASE_RE.findall(clean_title):  # CamelCase
             if term.lower() not in self._KEYWORD_STOP_WORDS:
                 keywords.add(term)
-        for term in re.findall(r'\b[a-z]+(?:_[a-z]+)+\b', clean_title):  # snake_case
+        for term in _SNAKE_CASE_RE.findall(clean_title):  # snake_case
             if term.lower() not in self._KEYWORD_STOP_WORDS:
                 keywords.add(term)
-        for term in re.findall(r'\b[a-z]+(?:-[a-z]+)+\b', clean_title):  # hyphenated
+        for term in _HYPHENATED_RE.findall(clean_title):  # hyphenated
             if term.lower() not in self._KEYWORD_STOP_WORDS:
                 keywords.add(term)
 
@@ -146,7 +660,7 @@ class GitHubClient:
                 keywords.add(filename)
 
         # 5. Add significant words from title (not in stop words)
-        title_words = re.findall(r'\b[a-zA-Z]{4,}\b', clean_title)
+        title_words = _TITLE_WORD_RE.findall(clean_title)
         for word in title_words:
             if word.lower() not in self._KEYWORD_STOP_WORDS:
                 keywords.add(word)
@@ -170,9 +684,7 @@ class GitHubClient:
         query = f"{keyword_query} repo:{REPO} is:issue"
 
         try:
-            # Use query params in URL path (GitHub Search API requires this)
-            endpoint = f"search/issues?q={quote(query)}&per_page={limit}"
-            results = _run_gh_api(endpoint)
+            results = self._get("/search/issues", params={"q": query, "per_page": limit})
 
             items = []
             for item in results.get("items", [])[:limit]:
@@ -197,9 +709,9 @@ class GitHubClient:
         query = f"author:{author} repo:{REPO} is:pr"
 
         try:
-            # Use query params in URL path (GitHub Search API requires this)
-            endpoint = f"search/issues?q={quote(query)}&per_page={limit}&sort=updated"
-            results = _run_gh_api(endpoint)
+            results = self._get(
+                "/search/issues", params={"q": query, "per_page": limit, "sort": "updated"}
+            )
 
             items = []
             for item in results.get("items", [])[:limit]:
@@ -225,46 +737,42 @@ class GitHubClient:
         if not files:
             return []
 
-        pr_numbers = set()
-        pr_ref_pattern = re.compile(r"(?:PR\s*)?#(\d{3,})|(?:Fixes|Closes)\s+#(\d{3,})", re.IGNORECASE)
-
-        # Check commits for first 3 modified files
-        for file_path in files[:3]:
+        def recent_commits(file_path: str) -> list[dict]:
             try:
-                # Get recent commits for this file
-                commits = _run_gh_api(
-                    f"repos/{REPO}/commits",
-                    "-F", f"path={file_path}",
-                    "-F", "per_page=10"
+                return self._get_list(
+                    f"{_REPO_PATH}/commits", params={"path": file_path, "per_page": 10}
                 )
+            except Exception:
+                return []
 
-                for commit in (commits if isinstance(commits, list) else []):
+        # Check recent commits for the first 3 modified files, concurrently
+        pr_numbers = set()
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            for commits in pool.map(recent_commits, files[:3]):
+                for commit in commits:
                     message = commit.get("commit", {}).get("message", "")
-                    for match in pr_ref_pattern.finditer(message):
+                    for match in _COMMIT_PR_REF_RE.finditer(message):
                         num = match.group(1) or match.group(2)
                         if num:
                             pr_numbers.add(int(num))
-            except Exception:
-                continue
 
         if not pr_numbers:
             return []
 
-        # Fetch PR details for found numbers
+        # Fetch PR details for found numbers (shares the linked-ref cache)
+        numbers = sorted(pr_numbers, reverse=True)[:limit]
+        prs = [ref for ref in self._resolve_refs(numbers) if ref["kind"] == "pull"]
+
         items = []
-        for num in sorted(pr_numbers, reverse=True)[:limit]:
-            try:
-                data = _run_gh_api(f"repos/{REPO}/pulls/{num}")
-                body = data.get("body") or ""
-                summary = body[:200] + ("..." if len(body) > 200 else "")
-                items.append({
-                    "number": data["number"],
-                    "title": data["title"],
-                    "summary": summary,
-                    "state": data["state"],
-                })
-            except Exception:
-                continue
+        for data in prs:
+            body = data.get("body") or ""
+            summary = body[:200] + ("..." if len(body) > 200 else "")
+            items.append({
+                "number": data["number"],
+                "title": data["title"],
+                "summary": summary,
+                "state": data["state"],
+            })
 
         return items[:limit]
 
@@ -272,28 +780,93 @@ class GitHubClient:
 
     def fetch_pr(self, number: int) -> dict:
         """Fetch PR metadata, diff, comments, and reviews."""
-        # Get PR metadata
-        pr = _run_gh_api(f"repos/{REPO}/pulls/{number}")
+        # Metadata, comments and reviews come from one GraphQL query (REST
+        # without a token); the diff downloads alongside it
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            diff_future = pool.submit(self.fetch_diff, number)
+            try:
+                result = self._fetch_pr_graphql(number)
+            except (RuntimeError, httpx.HTTPError):
+                result = self._fetch_pr_rest(number)
+            result["diff"] = diff_future.result()
+        changed_files = result["changed_files"]
+
+        # Add related context (graceful degradation for each category). The
+        # lookups depend only on the PR, so they run concurrently too.
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            context_futures = {
+                "related_issues": pool.submit(
+                    lambda: self._search_related_issues(
+                        self._extract_keywords(result["title"], result["body"], changed_files)
+                    )
+                ),
+                "author_recent_prs": pool.submit(self._get_author_recent_prs, result["user"]),
+                "referenced_prs_from_history": pool.submit(
+                    self._get_prs_from_commit_history, changed_files
+                ),
+            }
 
-        # Get diff using gh pr view
-        try:
-            diff = _run_gh("pr", "view", str(number), "--repo", REPO, "--json", "diff", "--jq", ".diff")
-        except RuntimeError:
-            diff = ""
+        related_context = {}
+        for name, future in context_futures.items():
+            try:
+                related_context[name] = future.result()
+            except Exception:
+                related_context[name] = []
+
+        result["related_context"] = related_context
 
-        if len(diff) > DIFF_CHAR_LIMIT:
-            diff = diff[:DIFF_CHAR_LIMIT] + f"\n\n... diff truncated at {DIFF_CHAR_LIMIT} chars ..."
+        return result
 
-        # Get comments, reviews, and files
-        comments = _run_gh_api(f"repos/{REPO}/issues/{number}/comments")
-        review_comments = _run_gh_api(f"repos/{REPO}/pulls/{number}/comments")
-        reviews = _run_gh_api(f"repos/{REPO}/pulls/{number}/reviews")
-        files = _run_gh_api(f"repos/{REPO}/pulls/{number}/files")
+    def _fetch_pr_graphql(self, number: int) -> dict:
+        """fetch_pr's fields other than the diff, from a single GraphQL query."""
+        data = self._graphql(_PR_QUERY, {"owner": _REPO_OWNER, "name": _REPO_NAME, "number": number})
+        pull = (data.get("repository") or {}).get("pullRequest")
+        if not pull:
+            raise RuntimeError(f"PR #{number} not found via GraphQL")
+        files = pull["files"]
+        if files["pageInfo"]["hasNextPage"]:
+            changed_files = self.fetch_changed_files(number)
+        else:
+            changed_files = [node["path"] for node in files["nodes"]]
+        reviews = pull["reviews"]["nodes"]
+        state = pull["state"].lower()
+        return {
+            "number": pull["number"],
+            "title": pull["title"],
+            "body": pull.get("body") or "",
+            "state": "closed" if state == "merged" else state,  # REST shape
+            "user": _login(pull.get("author")),
+            "labels": [l["name"] for l in pull["labels"]["nodes"]],
+            "base_ref": pull["baseRefName"],
+            "head_ref": pull["headRefName"],
+            "head_sha": pull["headRefOid"],
+            "changed_files": changed_files,
+            "comments": [
+                {"user": _login(c.get("author")), "body": c["body"]}
+                for c in pull["comments"]["nodes"]
+            ],
+            "review_comments": [
+                {"user": _login(c.get("author")), "path": c.get("path") or "", "body": c["body"]}
+                for r in reviews
+                for c in r["comments"]["nodes"]
+            ],
+            "reviews": [
+                {"user": _login(r.get("author")), "state": r["state"], "body": r.get("body") or ""}
+                for r in reviews
+            ],
+        }
 
-        changed_files = [f["filename"] for f in files] if isinstance(files, list) else []
+    def _fetch_pr_rest(self, number: int) -> dict:
+        """fetch_pr's fields other than the diff, from concurrent REST calls."""
+        with ThreadPoolExecutor(max_workers=5) as pool:
+            pr_future = pool.submit(self._get, f"{_REPO_PATH}/pulls/{number}")
+            comments_future = pool.submit(self._get_list, f"{_REPO_PATH}/issues/{number}/comments")
+            review_comments_future = pool.submit(self._get_list, f"{_REPO_PATH}/pulls/{number}/comments")
+            reviews_future = pool.submit(self._get_list, f"{_REPO_PATH}/pulls/{number}/reviews")
+            files_future = pool.submit(self.fetch_changed_files, number)
 
-        # Build base result
-        result = {
+        pr = pr_future.result()
+        return {
             "number": pr["number"],
             "title": pr["title"],
             "body": pr.get("body") or "",
@@ -303,11 +876,10 @@ class GitHubClient:
             "base_ref": pr["base"]["ref"],
             "head_ref": pr["head"]["ref"],
             "head_sha": pr["head"]["sha"],
-            "diff": diff,
-            "changed_files": changed_files,
+            "changed_files": files_future.result(),
             "comments": [
                 {"user": c["user"]["login"], "body": c["body"]}
-                for c in (comments if isinstance(comments, list) else [])
+                for c in comments_future.result()
             ],
             "review_comments": [
                 {
@@ -315,7 +887,7 @@ class GitHubClient:
                     "path": c.get("path", ""),
                     "body": c["body"],
                 }
-                for c in (review_comments if isinstance(review_comments, list) else [])
+                for c in review_comments_future.result()
             ],
             "reviews": [
                 {
@@ -323,88 +895,207 @@ class GitHubClient:
                     "state": r["state"],
                     "body": r.get("body") or "",
                 }
-                for r in (reviews if isinstance(reviews, list) else [])
+                for r in reviews_future.result()
             ],
         }
 
-        # Add related context (graceful degradation for each category)
-        related_context = {}
-
-        try:
-            keywords = self._extract_keywords(pr["title"], pr.get("body") or "", changed_files)
-            related_context["related_issues"] = self._search_related_issues(keywords)
-        except Exception:
-            related_context["related_issues"] = []
-
-        try:
-            related_context["author_recent_prs"] = self._get_author_recent_prs(pr["user"]["login"])
-        except Exception:
-            related_context["author_recent_prs"] = []
+    def fetch_changed_files(self, number: int) -> list[str]:
+        """List the paths changed by a PR, following pagination.
 
+        GraphQL returns only the paths; the REST fallback (no token) also
+        carries every file's patch text, which is discarded.
+        """
         try:
-            related_context["referenced_prs_from_history"] = self._get_prs_from_commit_history(changed_files)
-        except Exception:
-            related_context["referenced_prs_from_history"] = []
-
-        result["related_context"] = related_context
-
-        return result
+            return self._fetch_changed_files_graphql(number)
+        except (RuntimeError, httpx.HTTPError):
+            pass
+
+        paths: list[str] = []
+        page = 1
+        while True:
+            files = self._get_list(
+                f"{_REPO_PATH}/pulls/{number}/files", params={"per_page": 100, "page": page}
+            )
+            paths.extend(f["filename"] for f in files)
+            if len(files) < 100:
+                break
+            page += 1
+        return paths
+
+    def _fetch_changed_files_graphql(self, number: int) -> list[str]:
+        """Page through ``pullRequest.files`` fetching only each path."""
+        paths: list[str] = []
+        cursor = None
+        while True:
+            data = self._graphql(
+                _PR_FILES_QUERY,
+                {"owner": _REPO_OWNER, "name": _REPO_NAME, "number": number, "cursor": cursor},
+            )
+            pull = (data.get("repository") or {}).get("pullRequest")
+            if not pull:
+                raise RuntimeError(f"PR #{number} not found via GraphQL")
+            files = pull["files"]
+            paths.extend(node["path"] for node in files["nodes"])
+            if not files["pageInfo"]["hasNextPage"]:
+                return paths
+            cursor = files["pageInfo"]["endCursor"]
 
     def fetch_diff(self, number: int) -> str:
-        """Fetch raw unified diff for a PR."""
+        """Fetch raw unified diff for a PR.
+
+        The body is streamed and the download stops once DIFF_CHAR_LIMIT
+        bytes are buffered, so huge diffs are never fully transferred.
+        Results share the GET response cache, so an unchanged diff is
+        revalidated with ``If-None-Match`` instead of re-downloaded.
+        """
+        path = f"{_REPO_PATH}/pulls/{number}"
+        key = (path, "application/vnd.github.diff", ())
+        cached = self._cache_lookup(key)
+        if cached and time.monotonic() - cached[2] < _RESPONSE_TTL:
+            return cached[1]
+
+        headers = {"Accept": "application/vnd.github.diff"}
+        if cached and cached[0]:
+            name, value = cached[0]
+            headers[name] = value
+
+        buf = bytearray()
+        truncated = False
         try:
-            diff = _run_gh("pr", "view", str(number), "--repo", REPO, "--json", "diff", "--jq", ".diff")
-        except RuntimeError:
-            diff = ""
-        if len(diff) > DIFF_CHAR_LIMIT:
-            diff = diff[:DIFF_CHAR_LIMIT] + f"\n\n... diff truncated at {DIFF_CHAR_LIMIT} chars ..."
+            budget = self._pick_budget("core")
+            with budget.client.stream("GET", path, headers=headers) as resp:
+                budget.record(resp)
+                if resp.status_code == 304 and cached:
+                    self._cache_store(key, cached[0], cached[1])
+                    return cached[1]
+                if resp.is_error:
+                    return ""
+                validator = _validator(resp)
+                # An uncompressed body whose declared size fits the limit can be
+                # read in one go; otherwise stream and stop at the cap.
+                length = resp.headers.get("Content-Length", "")
+                if (
+                    "Content-Encoding" not in resp.headers
+                    and length.isdigit()
+                    and int(length) <= DIFF_CHAR_LIMIT
+                ):
+                    diff = resp.read().decode("utf-8", errors="replace")
+                    self._cache_store(key, validator, diff)
+                    return diff
+                for chunk in resp.iter_bytes(_DIFF_CHUNK_SIZE):
+                    buf.extend(chunk)
+                    if len(buf) > DIFF_CHAR_LIMIT:
+                        truncated = True
+                        break
+        except httpx.HTTPError:
+            return ""
+
+        if truncated:
+            # Trim in place to the last complete line within the limit, so the
+            # diff parsers never see a half line (or a split UTF-8 sequence)
+            cut = buf.rfind(b"\n", 0, DIFF_CHAR_LIMIT)
+            del buf[cut if cut > 0 else DIFF_CHAR_LIMIT:]
+        diff = buf.decode("utf-8", errors="replace")
+        if truncated:
+            diff += f"\n\n... diff truncated at {DIFF_CHAR_LIMIT} chars ..."
+        self._cache_store(key, validator, diff)
         return diff
 
     # -- Linked references -----------------------------------------------
 
     def fetch_linked_refs(self, body: str, exclude_number: int | None = None) -> list[dict]:
         """Parse #refs and GitHub URLs from a PR body, fetch each."""
-        numbers: set[int] = set()
-        for pat in _REF_PATTERNS:
-            for m in pat.finditer(body):
-                numbers.add(int(m.group(1)))
+        numbers = {int(m.group(1) or m.group(2)) for m in _REF_RE.finditer(body)}
         if exclude_number:
             numbers.discard(exclude_number)
+        if not numbers:
+            return []
+        return self._resolve_refs(sorted(numbers))
 
-        results = []
-        for num in sorted(numbers):
+    def _resolve_refs(self, numbers: list[int]) -> list[dict]:
+        """Resolve issues/PRs by number, in order, skipping ones that don't exist.
+
+        Refs seen within _REF_TTL seconds come from memory: a review looks up
+        the same linked issues from the PR body, commit history and re-runs.
+        """
+        now = time.monotonic()
+        cache = self._ref_cache
+        missing = [n for n in numbers if n not in cache or now - cache[n][0] >= _REF_TTL]
+        if missing:
+            # One GraphQL round trip covers every ref; fall back to REST without a token
             try:
-                # Try as PR first
-                data = _run_gh_api(f"repos/{REPO}/pulls/{num}")
-                kind = "pull"
-            except RuntimeError:
-                try:
-                    data = _run_gh_api(f"repos/{REPO}/issues/{num}")
-                    kind = "issue"
-                except RuntimeError:
-                    continue
+                found = {}
+                for i in range(0, len(missing), _REFS_PER_QUERY):
+                    batch = self._fetch_refs_graphql(missing[i:i + _REFS_PER_QUERY])
+                    found.update((ref["number"], ref) for ref in batch)
+                fetched = [found.get(n) for n in missing]
+            except (RuntimeError, httpx.HTTPError):
+                # Lookups are independent; cap workers to stay under GitHub's secondary rate limit
+                with ThreadPoolExecutor(max_workers=_LINKED_REF_WORKERS) as pool:
+                    fetched = list(pool.map(self._fetch_ref, missing))
+            for num, ref in zip(missing, fetched):
+                cache[num] = (now, ref)
+        return [ref for n in numbers if (ref := cache[n][1]) is not None]
+
+    def _fetch_refs_graphql(self, numbers: list[int]) -> list[dict]:
+        """Resolve issues/PRs by number with a single aliased GraphQL query."""
+        fields = "\n".join(
+            f"    r{num}: issueOrPullRequest(number: {num}) {{ ...RefFields }}" for num in numbers
+        )
+        query = (
+            "query($owner: String!, $name: String!) {\n"
+            f"  repository(owner: $owner, name: $name) {{\n{fields}\n  }}\n"
+            "}\n" + _REF_FRAGMENT
+        )
+        data = self._graphql(query, {"owner": _REPO_OWNER, "name": _REPO_NAME})
+        repo = data.get("repository") or {}
+
+        results = []
+        for num in numbers:
+            node = repo.get(f"r{num}")
+            if not node:
+                continue
+            # REST reports merged PRs as "closed"; keep that shape
+            state = node["state"].lower()
             results.append({
                 "number": num,
-                "kind": kind,
-                "title": data["title"],
-                "body": data.get("body") or "",
-                "state": data["state"],
-                "user": data["user"]["login"],
+                "kind": "pull" if node["__typename"] == "PullRequest" else "issue",
+                "title": node["title"],
+                "body": node.get("body") or "",
+                "state": "closed" if state == "merged" else state,
+                "user": (node.get("author") or {}).get("login", "ghost"),
             })
         return results
 
+    def _fetch_ref(self, num: int) -> dict | None:
+        """Fetch a single issue or PR by number; None if neither exists.
+
+        Every PR is also an issue, so one /issues/{n} call covers both and its
+        ``pull_request`` field tells them apart.
+        """
+        try:
+            data = self._get(f"{_REPO_PATH}/issues/{num}")
+        except (RuntimeError, httpx.HTTPError):  # skip just this ref
+            return None
+        return {
+            "number": num,
+            "kind": "pull" if "pull_request" in data else "issue",
+            "title": data["title"],
+            "body": data.get("body") or "",
+            "state": data["state"],
+            "user": data["user"]["login"],
+        }
+
     # -- File contents ---------------------------------------------------
 
     def fetch_file(self, path: str, ref: str = "main") -> str:
         """Fetch a file's contents from the repo at a given ref."""
-        result = subprocess.run(
-            ["gh", "api", f"repos/{REPO}/contents/{path}?ref={ref}",
-             "-H", "Accept: application/vnd.github.raw+json"],
-            capture_output=True, text=True,
+        return self._conditional_get(
+            f"{_REPO_PATH}/contents/{path}",
+            {"ref": ref},
+            accept="application/vnd.github.raw+json",
+            parse=lambda resp: resp.text,
         )
-        if result.returncode != 0:
-            raise RuntimeError(f"Failed to fetch file: {result.stderr.strip()}")
-        return result.stdout
 
     # -- List PRs --------------------------------------------------------
 
@@ -415,8 +1106,51 @@ class GitHubClient:
             state: PR state filter (open, closed, all)
             limit: Maximum number of PRs to return
             sort: Sort field - "updated" (last activity) or "created" (newest first)
+
+        Uses one GraphQL query for exactly these fields when authenticated.
+        GraphQL can't answer 304, so results are reused for
+        _RECENT_PRS_TTL seconds to keep polling cheap.
         """
-        prs = _run_gh_api(f"repos/{REPO}/pulls", "-F", f"state={state}", "-F", f"per_page={limit}", "-F", f"sort={sort}")
+        key = (state, limit, sort)
+        cached = self._recent_prs_cache.get(key)
+        if cached and time.monotonic() - cached[0] < _RECENT_PRS_TTL:
+            return cached[1]
+        try:
+            prs = self._list_recent_prs_graphql(state, limit, sort)
+        except (RuntimeError, httpx.HTTPError):
+            prs = self._list_recent_prs_rest(state, limit, sort)
+        self._recent_prs_cache[key] = (time.monotonic(), prs)
+        return prs
+
+    def _list_recent_prs_graphql(self, state: str, limit: int, sort: str) -> list[dict]:
+        """List PRs via GraphQL, shaped like the REST listing."""
+        data = self._graphql(_RECENT_PRS_QUERY, {
+            "owner": _REPO_OWNER,
+            "name": _REPO_NAME,
+            "n": min(limit, 100),
+            "states": _GRAPHQL_PR_STATES.get(state),
+            "field": "CREATED_AT" if sort == "created" else "UPDATED_AT",
+        })
+        nodes = (data.get("repository") or {}).get("pullRequests", {}).get("nodes", [])
+        return [
+            {
+                "number": p["number"],
+                "title": p["title"],
+                "user": (p.get("author") or {}).get("login", "ghost"),
+                "state": "open" if p["state"] == "OPEN" else "closed",
+                "created_at": p["createdAt"],
+                "updated_at": p["updatedAt"],
+                "labels": [l["name"] for l in p["labels"]["nodes"]],
+            }
+            for p in nodes
+        ]
+
+    def _list_recent_prs_rest(self, state: str, limit: int, sort: str) -> list[dict]:
+        """List PRs via REST (no token); unchanged pages revalidate via ETag."""
+        prs = self._get_list(
+            f"{_REPO_PATH}/pulls",
+            params={"state": state, "per_page": limit, "sort": sort, "direction": "desc"},
+        )
         return [
             {
                 "number": p["number"],
@@ -427,23 +1161,36 @@ class GitHubClient:
                 "updated_at": p["updated_at"],
                 "labels": [l["name"] for l in p.get("labels", [])],
             }
-            for p in (prs if isinstance(prs, list) else [])
+            for p in prs
         ]
 
     # -- Post review -----------------------------------------------------
 
     def post_review_comment(self, pr_number: int, body: str, event: str = "COMMENT") -> dict:
-        """Post a comment on a PR via ``gh`` CLI.
-        event: APPROVE, REQUEST_CHANGES, or COMMENT."""
-        result = subprocess.run(
-            ["gh", "pr", "comment", str(pr_number), "--repo", REPO, "--body", body],
-            capture_output=True, text=True,
-        )
-        if result.returncode != 0:
-            raise RuntimeError(f"gh pr comment failed: {result.stderr.strip()}")
-        return {"posted_via": "gh_cli_comment", "pr_number": pr_number, "event": event}
+        """Submit a PR review through the REST Reviews API.
+        event: APPROVE, REQUEST_CHANGES, or COMMENT.
 
-    def post_inline_comment(self, pr_number: int, path: str, line: int, body: str, position: int | None = None, max_retries: int = 5) -> dict:
+        Falls back to a plain ``gh pr comment`` when no token is available.
+        """
+        if self._authenticated:
+            review = self._post(
+                f"{_REPO_PATH}/pulls/{pr_number}/reviews", {"body": body, "event": event}
+            )
+            return {"posted_via": "rest_review", "pr_number": pr_number, "event": event, "review_id": review.get("id")}
+
+        via = self._post_issue_comment(pr_number, body)
+        return {"posted_via": f"{via}_comment", "pr_number": pr_number, "event": event}
+
+    def post_inline_comment(
+        self,
+        pr_number: int,
+        path: str,
+        line: int,
+        body: str,
+        position: int | None = None,
+        max_retries: int = 5,
+        commit_id: str | None = None,
+    ) -> dict:
         """Post an inline comment on a specific line of a PR file.
 
         Uses GitHub's API with `commit_id` and `line` parameters.
@@ -455,92 +1202,109 @@ class GitHubClient:
             body: Comment text
             position: Position in the diff (optional, deprecated parameter)
             max_retries: Maximum number of retry attempts (default: 5)
+            commit_id: PR head SHA, if the caller already knows it (saves a request)
 
         Returns:
             dict with comment details
         """
-        import time
-
-        commit_id = self._get_pr_head_sha(pr_number)
+        if commit_id is None:
+            commit_id = self._get_pr_head_sha(pr_number)
 
         # If position not provided, try to find it by parsing the diff
         if position is None:
-            pr = self.fetch_pr(pr_number)
-            review_lines = self.parse_diff_for_review_lines(pr['diff'])
-            matching = [rl for rl in review_lines if rl['path'] == path and rl['line'] == line]
-            if matching:
-                position = matching[0]['position']
-            else:
-                # Line not in diff, fallback to regular comment
-                formatted_body = f"**{path}:{line}**\n\n{body}"
-                result = subprocess.run(
-                    ["gh", "pr", "comment", str(pr_number), "--repo", REPO, "--body", formatted_body],
-                    capture_output=True, text=True,
-                )
-                if result.returncode != 0:
-                    raise RuntimeError(f"gh pr comment failed: {result.stderr.strip()}")
-                return {"posted_via": "gh_cli_fallback", "pr_number": pr_number, "path": path, "line": line, "error": "Line not in diff"}
+            position = self._diff_positions(pr_number).get((path, line))
+            if position is None:
+                return self._post_line_not_in_diff(pr_number, path, line, body)
 
+        via = "rest" if self._authenticated else "gh_api"
+        error_msg = ""
         # Retry with exponential backoff
         for attempt in range(max_retries):
-            # Post inline comment using gh api with line parameter (new API)
-            result = subprocess.run([
-                "gh", "api", f"repos/{REPO}/pulls/{pr_number}/comments",
-                "-X", "POST",
-                "-f", f"body={body}",
-                "-f", f"path={path}",
-                "-F", f"line={line}",
-                "-f", f"commit_id={commit_id}",
-                "-f", "side=RIGHT",
-            ], capture_output=True, text=True)
-
-            if result.returncode == 0:
-                return {"posted_via": "gh_api_inline", "pr_number": pr_number, "path": path, "line": line, "position": position, "attempts": attempt + 1}
-
-            error_msg = result.stderr.strip()
+            # Post inline comment with the line parameter (new API)
+            try:
+                self._post_pr_review_comment(pr_number, {
+                    "body": body, "path": path, "line": line, "commit_id": commit_id, "side": "RIGHT",
+                })
+                return {"posted_via": f"{via}_inline", "pr_number": pr_number, "path": path, "line": line, "position": position, "attempts": attempt + 1}
+            except RuntimeError as e:
+                error_msg = str(e)
 
             # If it's a validation error (HTTP 422), try with position parameter
             if "422" in error_msg or "Validation Failed" in error_msg:
                 # Fall back to position-based comment
-                result = subprocess.run([
-                    "gh", "api", f"repos/{REPO}/pulls/{pr_number}/comments",
-                    "-X", "POST",
-                    "-f", f"body={body}",
-                    "-f", f"path={path}",
-                    "-F", f"position={position}",
-                    "-f", f"commit_id={commit_id}",
-                ], capture_output=True, text=True)
-
-                if result.returncode == 0:
-                    return {"posted_via": "gh_api_inline_position", "pr_number": pr_number, "path": path, "line": line, "position": position, "attempts": attempt + 1}
-
+                try:
+                    self._post_pr_review_comment(pr_number, {
+                        "body": body, "path": path, "position": position, "commit_id": commit_id,
+                    })
+                    return {"posted_via": f"{via}_inline_position", "pr_number": pr_number, "path": path, "line": line, "position": position, "attempts": attempt + 1}
+                except RuntimeError as e:
+                    error_msg = str(e)
                 break
 
             # For other errors, retry with exponential backoff
             if attempt < max_retries - 1:
                 wait_time = 2 ** attempt  # 1s, 2s, 4s, 8s, 16s
                 time.sleep(wait_time)
-                continue
 
         # All retries failed or validation error - fallback to formatted comment
-        error_msg = result.stderr.strip()
         formatted_body = f"**{path}:{line}**\n\n{body}\n\n---\n*Note: Could not post as inline comment. Error: {error_msg}*"
+        via = self._post_issue_comment(pr_number, formatted_body)
+        return {"posted_via": f"{via}_fallback", "pr_number": pr_number, "path": path, "line": line, "error": error_msg, "attempts": max_retries}
+
+    def _post_pr_review_comment(self, pr_number: int, fields: dict) -> dict:
+        """Create a review comment on a PR diff; uses ``gh api`` without a token."""
+        path = f"{_REPO_PATH}/pulls/{pr_number}/comments"
+        if self._authenticated:
+            return self._post(path, fields)
+        args = ["gh", "api", path.lstrip("/"), "-X", "POST"]
+        for key, value in fields.items():
+            # -F sends ints as JSON numbers, -f sends strings verbatim
+            args += ["-F" if isinstance(value, int) else "-f", f"{key}={value}"]
+        result = subprocess.run(args, capture_output=True, text=True)
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr.strip())
+        return _json_loads(result.stdout) if result.stdout.strip() else {}
+
+    def _post_issue_comment(self, pr_number: int, body: str) -> str:
+        """Post a regular (non-review) comment on a PR.
+
+        Goes through the REST API when authenticated, otherwise
+        ``gh pr comment``. Returns which of the two was used.
+        """
+        if self._authenticated:
+            self._post(f"{_REPO_PATH}/issues/{pr_number}/comments", {"body": body})
+            return "rest"
         result = subprocess.run(
-            ["gh", "pr", "comment", str(pr_number), "--repo", REPO, "--body", formatted_body],
+            ["gh", "pr", "comment", str(pr_number), "--repo", REPO, "--body", body],
             capture_output=True, text=True,
         )
         if result.returncode != 0:
             raise RuntimeError(f"gh pr comment failed: {result.stderr.strip()}")
-        return {"posted_via": "gh_cli_fallback", "pr_number": pr_number, "path": path, "line": line, "error": error_msg, "attempts": max_retries}
+        return "gh_cli"
+
+    def _diff_positions(self, pr_number: int) -> dict[tuple[str, int], int]:
+        """Map (path, line) of every added line in a PR's diff to its diff position."""
+        positions: dict[tuple[str, int], int] = {}
+        # Uncapped: a comment on any added line must find its position
+        for rl in self._iter_review_lines(self.fetch_diff(pr_number), file_char_limit=None):
+            positions.setdefault((rl["path"], rl["line"]), rl["position"])
+        return positions
+
+    def _post_line_not_in_diff(self, pr_number: int, path: str, line: int, body: str) -> dict:
+        """Post a comment for a line outside the diff as a regular PR comment."""
+        via = self._post_issue_comment(pr_number, f"**{path}:{line}**\n\n{body}")
+        return {"posted_via": f"{via}_fallback", "pr_number": pr_number, "path": path, "line": line, "error": "Line not in diff"}
 
     def _get_pr_head_sha(self, pr_number: int) -> str:
         """Get the head commit SHA of a PR."""
-        pr = _run_gh_api(f"repos/{REPO}/pulls/{pr_number}")
+        pr = self._get(f"{_REPO_PATH}/pulls/{pr_number}")
         return pr["head"]["sha"]
 
     # -- Inline comment workflow -----------------------------------------
 
-    def parse_diff_for_review_lines(self, diff: str) -> list[dict]:
+    def parse_diff_for_review_lines(
+        self, diff: str, offset: int = 0, limit: int | None = None
+    ) -> list[dict]:
         """Parse a diff and extract lines suitable for inline comments.
 
         Returns list of dicts with:
@@ -550,76 +1314,131 @@ class GitHubClient:
         - content: actual line content
         - context: surrounding lines for context (3 before/after)
 
-        Focuses on added lines (+ prefix) in the diff.
+        Focuses on added lines (+ prefix) in the diff. Only the first
+        _DIFF_FILE_CHAR_LIMIT chars of each lockfile or generated file's diff
+        (_GENERATED_FILE_RE) are considered; other files are parsed in full.
+        ``offset``/``limit`` select a page of the results; parsing stops
+        once the page is filled.
+        """
+        stop = None if limit is None else offset + limit
+        return list(islice(self._iter_review_lines(diff), offset, stop))
+
+    def _iter_review_lines(
+        self, diff: str, file_char_limit: int | None = _DIFF_FILE_CHAR_LIMIT
+    ) -> Iterator[dict]:
+        """Yield parse_diff_for_review_lines results in diff order, lazily.
+
+        An added line is yielded once its after-context is complete: after
+        the next 3 lines, or at the next hunk/file header. Only the first
+        ``file_char_limit`` chars of each generated file's diff are parsed
+        (None: all).
         """
-        lines = diff.split("\n")
-        results = []
         current_file = None
+        in_header = True  # Between "diff --git" and the file's first hunk
+        capped = False  # Current file is generated and subject to file_char_limit
+        file_chars = 0  # Size of the current file's diff so far
+        skipping = False  # Past the current file's budget
+        is_generated = _GENERATED_FILE_RE.search
         current_line = 0
         diff_position = 0  # Track position in diff for GitHub API
-        context_buffer = []
+        context_buffer: deque[str] = deque(maxlen=3)  # Last 3 lines before an add
+        # Added lines still collecting context after them: [result, context lines, lines left],
+        # oldest first; results are yielded from here, so diff order is kept
+        pending: deque[list] = deque()
+        # Hoisted bound methods: these run once per diff line
+        add_context = context_buffer.append
+        add_pending = pending.append
+
+        for line in _iter_lines(diff):
+            # Feed this line to the "after" context of recent added lines;
+            # a new hunk or file ends their context early.
+            if pending:
+                if line.startswith(("@@", "diff --git")):
+                    for result, context, _ in pending:
+                        result["context"] = "\n".join(context)
+                        yield result
+                    pending.clear()
+                else:
+                    for entry in pending:
+                        entry[1].append(line)
+                        entry[2] -= 1
+                    while pending and pending[0][2] == 0:
+                        result, context, _ = pending.popleft()
+                        result["context"] = "\n".join(context)
+                        yield result
+
+            # Dispatch on the first character; only ambiguous prefixes need a
+            # second startswith probe.
+            tag = line[:1]
 
-        for i, line in enumerate(lines):
             # Track file being modified
-            if line.startswith("diff --git"):
-                # Extract file path from "diff --git a/path b/path"
-                parts = line.split()
-                if len(parts) >= 4:
-                    current_file = parts[3][2:]  # Remove "b/" prefix
-                context_buffer = []
+            if tag == "d" and line.startswith("diff --git"):
+                # Provisional path; the "+++ b/" header below is authoritative
+                current_file = _diff_git_path(line) or current_file
+                capped = file_char_limit is not None and bool(is_generated(current_file or ""))
+                in_header = True
+                context_buffer.clear()
                 diff_position = 0  # Reset position for new file
+                file_chars = 0
+                skipping = False
+                continue
+
+            # Fast-forward through the rest of an oversized generated file
+            if skipping:
+                continue
+            file_chars += len(line) + 1
+            if capped and file_chars > file_char_limit:
+                skipping = True
                 continue
 
             # Track line numbers from hunk headers
-            if line.startswith("@@"):
-                # Parse @@ -old_start,old_count +new_start,new_count @@
-                match = re.search(r"\+(\d+)", line)
-                if match:
+            if tag == "@" and line.startswith("@@"):
+                if match := _HUNK_RE.match(line):
                     current_line = int(match.group(1))
-                context_buffer = []
-                diff_position += 1  # Hunk header counts as a position
+                context_buffer.clear()
+                # Positions count from the file's first hunk header; later
+                # hunk headers take a position themselves
+                if not in_header:
+                    diff_position += 1
+                in_header = False
+                continue
+
+            # File header lines (index, mode, rename, ---/+++) take no position
+            if in_header:
+                if line.startswith("+++ b/"):
+                    current_file = _plus_header_path(line)
+                    capped = file_char_limit is not None and bool(is_generated(current_file))
                 continue
 
-            # Skip if we don't have a file context yet
-            if current_file is None:
+            # Skip if we don't have a file context yet, and
+            # "\\ No newline at end of file" markers entirely
+            if current_file is None or tag == "\\":
                 continue
 
             # Increment diff position for all lines in the hunk
-            if not line.startswith("\\"):  # Skip "\ No newline at end of file"
-                diff_position += 1
-
-            # Track added lines
-            if line.startswith("+") and not line.startswith("+++"):
-                # Get context (last 3 lines from buffer)
-                context_before = context_buffer[-3:] if len(context_buffer) >= 3 else context_buffer[:]
-
-                # Get context after (next 3 lines)
-                context_after = []
-                for j in range(i + 1, min(i + 4, len(lines))):
-                    next_line = lines[j]
-                    if next_line.startswith("@@") or next_line.startswith("diff --git"):
-                        break
-                    if not next_line.startswith("---") and not next_line.startswith("+++"):
-                        context_after.append(next_line)
+            diff_position += 1
 
-                results.append({
+            if tag == "+":
+                result = {
                     "path": current_file,
                     "line": current_line,
                     "position": diff_position,
                     "content": line[1:],  # Remove + prefix
-                    "context": "\n".join(context_before + [line] + context_after),
-                })
+                    "context": "",  # Filled in once the next 3 lines are seen
+                }
+                add_pending([result, [*context_buffer, line], 3])
                 current_line += 1
-            elif line.startswith("-") and not line.startswith("---"):
+            elif tag == "-":
                 # Deleted line, don't increment line counter
-                context_buffer.append(line)
-            elif not line.startswith("\\"):
+                add_context(line)
+            else:
                 # Context line (no prefix) or other content
-                if not line.startswith("+++") and not line.startswith("---"):
-                    context_buffer.append(line)
-                    current_line += 1
+                add_context(line)
+                current_line += 1
 
-        return results
+        for result, context, _ in pending:
+            result["context"] = "\n".join(context)
+            yield result
 
     def post_review_with_inline_comments(
         self,
@@ -628,7 +1447,12 @@ class GitHubClient:
         inline_comments: list[dict],
         event: str = "COMMENT",
     ) -> dict:
-        """Post a review summary followed by inline comments one-by-one.
+        """Post a review summary with its inline comments.
+
+        Comments on lines in the diff are submitted together with the
+        summary as one review through the Reviews API. If that is not
+        possible (no token, or GitHub rejects the batch), the summary and
+        each comment are posted individually instead.
 
         Args:
             pr_number: PR number
@@ -663,6 +1487,50 @@ class GitHubClient:
             "failed": 0,
         }
 
+        # Resolve every comment's diff position from one diff fetch and parse,
+        # and the head SHA once for every comment
+        try:
+            positions = self._diff_positions(pr_number)
+        except Exception:
+            positions = {}
+        try:
+            head_sha = self._get_pr_head_sha(pr_number)
+        except Exception:
+            head_sha = None  # post_inline_comment retries the lookup itself
+
+        # Submit the summary and all in-diff comments as a single review
+        if self._authenticated:
+            in_diff = [
+                c for c in deduplicated_comments
+                if (c.get("path"), c.get("line")) in positions and "body" in c
+            ]
+            try:
+                review = self._post_review_batch(pr_number, summary, event, in_diff, head_sha)
+            except RuntimeError:
+                review = None
+            if review is not None:
+                results["summary_posted"] = True
+                batched = {id(c) for c in in_diff}
+                jobs = []
+                for comment in deduplicated_comments:
+                    if id(comment) in batched:
+                        path, line = comment["path"], comment["line"]
+                        outcome = {
+                            "posted_via": "rest_review_batch",
+                            "pr_number": pr_number,
+                            "path": path,
+                            "line": line,
+                            "position": positions[(path, line)],
+                            "review_id": review.get("id"),
+                        }
+                    else:
+                        outcome = lambda comment=comment: self._post_line_not_in_diff(
+                            pr_number, comment["path"], comment["line"], comment["body"]
+                        )
+                    jobs.append((comment, outcome))
+                self._record_inline_results(results, jobs)
+                return results
+
         # Post summary first
         try:
             self.post_review_comment(pr_number, summary, event)
@@ -671,32 +1539,81 @@ class GitHubClient:
             results["summary_error"] = str(e)
             # Continue with inline comments even if summary fails
 
-        # Post inline comments one-by-one (deduplicated)
-        for comment in deduplicated_comments:
-            try:
-                path = comment["path"]
-                line = comment["line"]
-                body = comment["body"]
-
-                result = self.post_inline_comment(pr_number, path, line, body)
-                results["inline_comments"].append({
-                    "path": path,
-                    "line": line,
-                    "status": "success",
-                    "result": result,
-                })
-                results["successful"] += 1
-            except Exception as e:
-                results["inline_comments"].append({
-                    "path": comment.get("path", "unknown"),
-                    "line": comment.get("line", 0),
-                    "status": "failed",
-                    "error": str(e),
-                })
-                results["failed"] += 1
-
+        # Post inline comments individually (deduplicated), after the summary
+        def post(comment: dict) -> dict:
+            path, line, body = comment["path"], comment["line"], comment["body"]
+            position = positions.get((path, line))
+            if position is None:
+                return self._post_line_not_in_diff(pr_number, path, line, body)
+            return self.post_inline_comment(
+                pr_number, path, line, body, position=position, commit_id=head_sha
+            )
+
+        self._record_inline_results(
+            results, [(comment, functools.partial(post, comment)) for comment in deduplicated_comments]
+        )
         return results
 
+    def _post_review_batch(
+        self,
+        pr_number: int,
+        summary: str,
+        event: str,
+        comments: list[dict],
+        commit_id: str | None = None,
+    ) -> dict:
+        """Create one review carrying the summary and the given in-diff comments."""
+        payload = {
+            "commit_id": commit_id or self._get_pr_head_sha(pr_number),
+            "body": summary,
+            "event": event,
+            "comments": [
+                {"path": c["path"], "line": c["line"], "side": "RIGHT", "body": c["body"]}
+                for c in comments
+            ],
+        }
+        return self._post(f"{_REPO_PATH}/pulls/{pr_number}/reviews", payload)
+
+    @classmethod
+    def _record_inline_results(cls, results: dict, jobs: list[tuple[dict, dict | Callable[[], dict]]]) -> None:
+        """Record (comment, outcome) pairs in order, running the posting callables concurrently."""
+        if sum(callable(outcome) for _, outcome in jobs) > 1:
+            with ThreadPoolExecutor(max_workers=_INLINE_POST_WORKERS) as pool:
+                # A future's result() re-raises the post's exception, so
+                # failures are still recorded per comment
+                jobs = [
+                    (comment, pool.submit(outcome).result if callable(outcome) else outcome)
+                    for comment, outcome in jobs
+                ]
+        for comment, outcome in jobs:
+            cls._record_inline_result(results, comment, outcome)
+
+    @staticmethod
+    def _record_inline_result(results: dict, comment: dict, outcome: dict | Callable[[], dict]) -> None:
+        """Append one inline comment's outcome to a results dict.
+
+        ``outcome`` is either the posted comment's details or a callable
+        that posts it; exceptions from the callable are recorded as failures.
+        """
+        try:
+            result = outcome() if callable(outcome) else outcome
+        except Exception as e:
+            results["inline_comments"].append({
+                "path": comment.get("path", "unknown"),
+                "line": comment.get("line", 0),
+                "status": "failed",
+                "error": str(e),
+            })
+            results["failed"] += 1
+            return
+        results["inline_comments"].append({
+            "path": comment["path"],
+            "line": comment["line"],
+            "status": "success",
+            "result": result,
+        })
+        results["successful"] += 1
+
     # -- Smart Context Fetching ------------------------------------------
 
     def extract_imports_from_diff(self, diff: str, file_path: str | None = None) -> dict:
@@ -714,47 +1631,46 @@ class GitHubClient:
             }
         """
         imports_by_file = {}
-        lines = diff.split("\n")
-        current_file = None
 
-        for line in lines:
-            # Track current file
-            if line.startswith("diff --git"):
-                parts = line.split()
-                if len(parts) >= 4:
-                    current_file = parts[3][2:]  # Remove "b/" prefix
-                    if file_path and current_file != file_path:
-                        current_file = None
-                        continue
-                    imports_by_file[current_file] = {
-                        "added_imports": [],
-                        "removed_imports": [],
-                        "modules": []
-                    }
-
-            if not current_file:
+        def scan(entry: dict, start: int, end: int) -> None:
+            # One C-level regex sweep over the file's section of the diff
+            for match in _DIFF_IMPORT_RE.finditer(diff, start, end):
+                sign, content, from_mod, imp_mod = match.groups()
+                if sign == "+":
+                    entry["added_imports"].append(content)
+                    entry["modules"].append(from_mod or imp_mod)
+                else:
+                    entry["removed_imports"].append(content)
+
+        current = None  # imports_by_file entry of the file being scanned
+        start = 0
+        for header in _DIFF_HEADER_RE.finditer(diff):
+            current_file = _diff_git_path(header.group(0))
+            if current_file is None or (header.start() and diff[header.start() - 1] != "\n"):
                 continue
-
-            # Extract imports from added lines
-            if line.startswith("+") and not line.startswith("+++"):
-                content = line[1:].strip()
-                if re.match(r'^(from\s+[\w.]+\s+import|import\s+[\w.,\s]+)', content):
-                    imports_by_file[current_file]["added_imports"].append(content)
-                    # Extract module name
-                    if content.startswith("from "):
-                        match = re.match(r'from\s+([\w.]+)', content)
-                        if match:
-                            imports_by_file[current_file]["modules"].append(match.group(1))
-                    elif content.startswith("import "):
-                        match = re.match(r'import\s+([\w.]+)', content)
-                        if match:
-                            imports_by_file[current_file]["modules"].append(match.group(1))
-
-            # Extract imports from removed lines
-            elif line.startswith("-") and not line.startswith("---"):
-                content = line[1:].strip()
-                if re.match(r'^(from\s+[\w.]+\s+import|import\s+[\w.,\s]+)', content):
-                    imports_by_file[current_file]["removed_imports"].append(content)
+            if current is not None:
+                scan(current, start, header.start())
+            # Prefer the "+++ b/" line, if any, from this file's header block
+            block_end = len(diff)
+            for marker in ("\n@@", "\ndiff --git "):
+                found = diff.find(marker, header.end())
+                if found != -1:
+                    block_end = min(block_end, found)
+            plus = diff.find("\n+++ b/", header.end(), block_end)
+            if plus != -1:
+                eol = diff.find("\n", plus + 1)
+                current_file = _plus_header_path(diff[plus + 1:eol if eol != -1 else len(diff)])
+            if file_path and current_file != file_path:
+                current = None
+            else:
+                current = imports_by_file[current_file] = {
+                    "added_imports": [],
+                    "removed_imports": [],
+                    "modules": []
+                }
+            start = header.end()
+        if current is not None:
+            scan(current, start, len(diff))
 
         # Remove files with no imports
         imports_by_file = {k: v for k, v in imports_by_file.items() if v["added_imports"] or v["removed_imports"]}
@@ -843,29 +1759,44 @@ class GitHubClient:
             query += f" path:{search_paths[0]}"
 
         try:
-            results = _run_gh_api("search/code", "-F", f"q={query}", "-F", "per_page=3")
+            results = self._get("/search/code", params={"q": query, "per_page": 3})
 
             locations = []
             for item in results.get("items", [])[:3]:
                 # Fetch file content to find exact line
                 try:
                     content = self.fetch_file(item["path"], ref)
-                    lines = content.split("\n")
-
-                    # Search for definition
-                    for i, line_content in enumerate(lines, 1):
-                        if f"def {symbol_name}" in line_content or f"class {symbol_name}" in line_content:
-                            # Get 10-line context
-                            start = max(0, i-5)
-                            end = min(len(lines), i+5)
-                            context = "\n".join(lines[start:end])
-
-                            locations.append({
-                                "path": item["path"],
-                                "line": i,
-                                "context": context
-                            })
+
+                    # Search for definition: earliest "def X" / "class X"
+                    # offset, without splitting the whole file into lines
+                    hits = [
+                        idx
+                        for idx in (content.find(f"def {symbol_name}"), content.find(f"class {symbol_name}"))
+                        if idx >= 0
+                    ]
+                    if not hits:
+                        continue
+                    idx = min(hits)
+
+                    # Get 10-line context: 4 lines before through 5 after
+                    start = idx
+                    for _ in range(5):
+                        start = content.rfind("\n", 0, start)
+                        if start < 0:
+                            break
+                    start += 1  # -1 (no newline) becomes 0
+                    end = idx
+                    for _ in range(6):
+                        end = content.find("\n", end + 1)
+                        if end < 0:
+                            end = len(content)
                             break
+
+                    locations.append({
+                        "path": item["path"],
+                        "line": content.count("\n", 0, idx) + 1,
+                        "context": content[start:end]
+                    })
                 except Exception:
                     continue
 
@@ -894,10 +1825,23 @@ class GitHubClient:
                 ]
             }
         """
+        # Classify every changed file in a single pass
+        deps_changed = models_changed = ci_changed = False
+        config_files = []
+        for f in changed_files:
+            if "requirements" in f or "setup.py" in f or "pyproject.toml" in f:
+                deps_changed = True
+            if "models/" in f:
+                models_changed = True
+            if "config" in f.lower() and f.endswith((".yaml", ".yml", ".json", ".toml")):
+                config_files.append(f)
+            if ".github/" in f or "Dockerfile" in f or "Makefile" in f:
+                ci_changed = True
+
         relevant_configs = []
 
         # Check for Python dependency changes
-        if any("requirements" in f or "setup.py" in f or "pyproject.toml" in f for f in changed_files):
+        if deps_changed:
             relevant_configs.append({
                 "path": "pyproject.toml",
                 "reason": "Python dependencies changed",
@@ -905,7 +1849,7 @@ class GitHubClient:
             })
 
         # Check for model changes
-        if any("models/" in f for f in changed_files):
+        if models_changed:
             relevant_configs.append({
                 "path": "vllm/model_executor/models/__init__.py",
                 "reason": "Model registry might need updates",
@@ -913,30 +1857,34 @@ class GitHubClient:
             })
 
         # Check for config file changes
-        if any("config" in f.lower() for f in changed_files):
-            for f in changed_files:
-                if "config" in f.lower() and f.endswith((".yaml", ".yml", ".json", ".toml")):
-                    relevant_configs.append({
-                        "path": f,
-                        "reason": "Configuration file modified",
-                        "exists": True
-                    })
+        for f in config_files:
+            relevant_configs.append({
+                "path": f,
+                "reason": "Configuration file modified",
+                "exists": True
+            })
 
         # Check for CI/build changes
-        if any(".github/" in f or "Dockerfile" in f or "Makefile" in f for f in changed_files):
+        if ci_changed:
             relevant_configs.append({
                 "path": ".github/workflows/",
                 "reason": "CI/build configuration changed",
                 "exists": True
             })
 
-        # Verify existence (simplified - skip for directories)
-        for config in relevant_configs:
+        # Verify existence concurrently (simplified - skip for directories);
+        # fetch_file results land in the response cache for later reads
+        def exists(path: str) -> bool:
             try:
-                if not config["path"].endswith("/"):
-                    self.fetch_file(config["path"])
-                config["exists"] = True
+                self.fetch_file(path)
             except Exception:
-                config["exists"] = False
+                return False
+            return True
+
+        files = [c for c in relevant_configs if not c["path"].endswith("/")]
+        if files:
+            with ThreadPoolExecutor(max_workers=min(len(files), _LINKED_REF_WORKERS)) as pool:
+                for config, found in zip(files, pool.map(exists, [c["path"] for c in files])):
+                    config["exists"] = found
 
         return {"relevant_configs": relevant_configs}
@@ -5,48 +5,126 @@
 
 from __future__ import annotations
 
+import os
+import sys
+import threading
 from pathlib import Path
 
 
 class KnowledgeBase:
     def __init__(self, root: Path):
         self._root = root
+        self._root_str = os.fspath(root)
+        self._reviews_str = os.path.join(self._root_str, "reviews")
         self._root.mkdir(parents=True, exist_ok=True)
         (self._root / "reviews").mkdir(exist_ok=True)
+        # path -> ((st_mtime_ns, st_size), text); a hit costs one stat() instead
+        # of a read. Size guards against same-tick rewrites on coarse-mtime filesystems.
+        self._cache: dict[str, tuple[tuple[int, int], str]] = {}
+        # ({directory: st_mtime_ns}, .md listing in walk order), see _md_files
+        self._listing: tuple[dict[str, int], list[tuple[str, str]]] | None = None
+
+    def _read(self, path: str | Path) -> str:
+        """Read a file, reusing the cached text while its mtime and size are unchanged."""
+        # Interned so a hit against a listing path compares by identity
+        key = sys.intern(os.fspath(path))
+        st = os.stat(key)
+        stamp = (st.st_mtime_ns, st.st_size)
+        cached = self._cache.get(key)
+        if cached and cached[0] == stamp:
+            return cached[1]
+        # Unbuffered binary read to EOF (the file may have changed since the
+        # stat), decoded explicitly rather than with the locale's encoding
+        with open(key, "rb", buffering=0) as f:
+            text = f.read().decode("utf-8")
+        self._cache[key] = (stamp, text)
+        return text
+
+    def _md_files(self) -> list[tuple[str, str]]:
+        """(relative name, full path) of every .md file under the root, unsorted.
+
+        The listing is cached with the mtime of every directory walked. Adding,
+        removing or renaming a file bumps its directory's mtime, so checking
+        the cache costs one stat per directory rather than a full walk.
+        """
+        if self._listing is not None:
+            dir_mtimes, files = self._listing
+            try:
+                if all(os.stat(d).st_mtime_ns == m for d, m in dir_mtimes.items()):
+                    return files
+            except FileNotFoundError:
+                pass
+
+        # One os.scandir walk: DirEntry type checks come from the directory
+        # listing itself, so no per-entry stat is needed
+        prefix = len(self._root_str) + 1
+        dir_mtimes = {}
+        files = []
+        stack = [self._root_str]
+        while stack:
+            directory = stack.pop()
+            # Stamp before listing, so a file added mid-walk forces a rescan
+            dir_mtimes[directory] = os.stat(directory).st_mtime_ns
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.name.endswith(".md"):
+                        # Interned once per rescan; these strings key the text
+                        # cache and every load_all/list_files result
+                        path = sys.intern(entry.path)
+                        files.append((sys.intern(path[prefix:]), path))
+        self._listing = (dir_mtimes, files)
+        return files
+
+    def _write(self, path: str, content: str) -> None:
+        """Write a file atomically: concurrent readers see the old or new text, never a partial one."""
+        # Unique per writer; the .tmp suffix keeps it out of the .md listing
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp, "wb") as f:
+                f.write(content.encode("utf-8"))
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+        self._listing = None  # don't rely on mtime granularity for our own writes
 
     def load_all(self) -> dict[str, str]:
-        """Load all markdown files from the knowledge base."""
+        """Load all markdown files from the knowledge base (in no particular order)."""
         result: dict[str, str] = {}
-        for p in sorted(self._root.rglob("*.md")):
-            key = str(p.relative_to(self._root))
-            result[key] = p.read_text()
+        for key, path in self._md_files():
+            result[key] = self._read(path)
         return result
 
     def load_file(self, name: str) -> str:
         """Load a specific knowledge base file."""
         path = self._root / name
-        if not path.exists():
-            raise FileNotFoundError(f"Knowledge file not found: {name}")
-        return path.read_text()
+        try:
+            return self._read(path)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Knowledge file not found: {name}") from None
 
     def save_review(self, pr_number: int, title: str, summary: str) -> str:
         """Save a review summary for a PR."""
-        path = self._root / "reviews" / f"pr-{pr_number}.md"
-        content = f"# PR #{pr_number}: {title}\n\n{summary}\n"
-        path.write_text(content)
-        return str(path)
+        path = os.path.join(self._reviews_str, f"pr-{pr_number}.md")
+        self._write(path, f"# PR #{pr_number}: {title}\n\n{summary}\n")
+        return path
 
     def add_note(self, filename: str, content: str) -> str:
         """Create or update a knowledge base note."""
         if not filename.endswith(".md"):
             filename += ".md"
-        path = self._root / filename
-        path.parent.mkdir(parents=True, exist_ok=True)
-        path.write_text(content)
-        return str(path)
+        path = os.path.join(self._root_str, filename)
+        # Top-level notes land in the root, which __init__ already created
+        if "/" in filename or os.sep in filename:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._write(path, content)
+        return path
 
     def list_files(self) -> list[str]:
         """List all files in the knowledge base."""
-        return sorted(
-            str(p.relative_to(self._root)) for p in self._root.rglob("*.md")
-        )
+        names = [name for name, _ in self._md_files()]
+        names.sort()
+        return names
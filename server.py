@@ -5,41 +5,200 @@
 
 from __future__ import annotations
 
+import functools
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict
 from pathlib import Path
+from typing import Any, Callable
 
+import anyio
+import httpx
 from mcp.server.fastmcp import FastMCP
 
-from reviewer.github import GitHubClient
+from reviewer._file_cache import FileCache
+from reviewer._review_index import ReviewIndex, diff_fingerprint
+from reviewer.github import GitHubClient, TransientAPIError
 from reviewer.knowledge import KnowledgeBase
 
+logger = logging.getLogger(__name__)
+
 mcp = FastMCP("vllm-omni-reviewer")
 
-_gh = GitHubClient()
-_kb = KnowledgeBase(Path(__file__).parent / ".knowledge")
+
+# Built on first use: importing the server stays cheap, and a tool only pays
+# for what it touches (token lookup and HTTP pools, or the .knowledge mkdirs)
+@functools.lru_cache(maxsize=None)
+def _github() -> GitHubClient:
+    return GitHubClient()
+
+
+@functools.lru_cache(maxsize=None)
+def _knowledge() -> KnowledgeBase:
+    return KnowledgeBase(Path(__file__).parent / ".knowledge")
+
+
+@functools.lru_cache(maxsize=None)
+def _file_cache() -> FileCache:
+    return FileCache(Path(__file__).parent / ".cache" / "files.sqlite3")
+
+
+@functools.lru_cache(maxsize=None)
+def _review_index() -> ReviewIndex:
+    return ReviewIndex(Path(__file__).parent / ".cache" / "reviews.sqlite3")
+
+
+# -- Read-through tool cache ---------------------------------------------
+
+
+def _ttl_cache(ttl: float, maxsize: int = 128) -> Callable:
+    """Serve repeat calls with the same positional args from memory for ``ttl`` seconds.
+
+    One review calls the same read tools several times (and some tools
+    reuse fetch_pr's result via ``peek``); this keeps them to one GitHub fetch.
+    """
+
+    def decorate(fn: Callable) -> Callable:
+        cache: dict[tuple, tuple[float, Any]] = {}
+        lock = threading.Lock()  # tools run on worker threads, see _threaded
+
+        @functools.wraps(fn)
+        def wrapper(*args):
+            now = time.monotonic()
+            hit = cache.get(args)
+            if hit and now - hit[0] < ttl:
+                return hit[1]
+            value = fn(*args)
+            with lock:
+                cache.pop(args, None)
+                cache[args] = (now, value)
+                if len(cache) > maxsize:
+                    del cache[next(iter(cache))]  # oldest entry
+            return value
+
+        def peek(*args):
+            """Return a still-fresh cached result without calling through, else None."""
+            hit = cache.get(args)
+            if hit and time.monotonic() - hit[0] < ttl:
+                return hit[1]
+            return None
+
+        wrapper.cache_clear = cache.clear
+        wrapper.peek = peek
+        return wrapper
+
+    return decorate
+
+
+# PR number -> the diff last handed out for it (fetch_pr or a diff tool), so
+# save_review fingerprints what was reviewed even if the PR moved on since
+_served_diffs: OrderedDict[int, str] = OrderedDict()
+_SERVED_DIFFS_MAX = 16
+_served_diffs_lock = threading.Lock()
+
+
+def _remember_diff(pr_number: int, diff: str) -> str:
+    """Record the diff handed out for a PR (see _served_diffs) and return it."""
+    with _served_diffs_lock:
+        _served_diffs.pop(pr_number, None)
+        _served_diffs[pr_number] = diff
+        if len(_served_diffs) > _SERVED_DIFFS_MAX:
+            _served_diffs.popitem(last=False)
+    return diff
+
+
+@_ttl_cache(60.0, maxsize=32)
+def _fetch_pr(pr_number: int) -> dict:
+    pr = _github().fetch_pr(pr_number)
+    _remember_diff(pr_number, pr["diff"])
+    return pr
+
+
+# Files at a commit SHA never change; branch/tag refs are refetched after this long
+_FILE_FRESH_SECONDS = 300.0
+_COMMIT_SHA_RE = re.compile(r"[0-9a-f]{40}")
+
+
+def _fetch_file(path: str, ref: str) -> str:
+    """fetch_file through the on-disk cache, which outlives the server process.
+
+    When a stale entry can't be refreshed (offline, rate-limited, GitHub
+    erroring), the last known contents are served rather than failing the
+    review. A 404/403 is passed on: the file is gone or no longer readable.
+    """
+    cache = _file_cache()
+    cached = cache.get(path, ref)
+    if cached and (_COMMIT_SHA_RE.fullmatch(ref) or time.time() - cached[1] < _FILE_FRESH_SECONDS):
+        return cached[0]
+    try:
+        content = _github().fetch_file(path, ref)
+    except (TransientAPIError, httpx.HTTPError):  # GitHub trouble, or no connection at all
+        if cached:
+            return cached[0]
+        raise
+    cache.put(path, ref, content)
+    return content
+
+
+def _pr_diff(pr_number: int) -> str:
+    """A PR's diff, taken from a recent fetch_pr result when there is one."""
+    pr = _fetch_pr.peek(pr_number)
+    return pr["diff"] if pr is not None else _remember_diff(pr_number, _github().fetch_diff(pr_number))
+
+
+def _pr_changed_files(pr_number: int) -> list[str]:
+    """A PR's changed paths, taken from a recent fetch_pr result when there is one."""
+    pr = _fetch_pr.peek(pr_number)
+    return pr["changed_files"] if pr is not None else _github().fetch_changed_files(pr_number)
+
+
+def _pr_changed(pr_number: int) -> None:
+    """Drop cached PR data after posting to it, so the next read shows the new state."""
+    _fetch_pr.cache_clear()
 
 
 # -- Tools ---------------------------------------------------------------
 
 
+def _threaded(fn: Callable) -> Callable:
+    """Run a blocking tool in a worker thread.
+
+    FastMCP calls sync tools directly on its event loop, so one slow GitHub
+    round trip would stall every other in-flight tool call.
+    """
+
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        return await anyio.to_thread.run_sync(functools.partial(fn, *args, **kwargs))
+
+    return wrapper
+
+
 @mcp.tool()
+@_threaded
 def fetch_pr(pr_number: int) -> dict:
     """Fetch PR metadata, diff, comments, and reviews for a given PR number."""
-    return _gh.fetch_pr(pr_number)
+    return _fetch_pr(pr_number)
 
 
 @mcp.tool()
+@_threaded
 def fetch_linked_refs(pr_body: str, exclude_number: int | None = None) -> list[dict]:
     """Parse and fetch all issues/PRs referenced in a PR body."""
-    return _gh.fetch_linked_refs(pr_body, exclude_number)
+    return _github().fetch_linked_refs(pr_body, exclude_number)
 
 
 @mcp.tool()
+@_threaded
 def fetch_file(path: str, ref: str = "main") -> str:
     """Fetch a file's contents from the repo at a given ref."""
-    return _gh.fetch_file(path, ref)
+    return _fetch_file(path, ref)
 
 
 @mcp.tool()
+@_threaded
 def list_recent_prs(state: str = "open", limit: int = 10, sort: str = "updated") -> list[dict]:
     """List recent PRs for browsing.
 
@@ -48,38 +207,98 @@ def list_recent_prs(state: str = "open", limit: int = 10, sort: str = "updated")
         limit: Maximum number of PRs to return (default: 10)
         sort: Sort order - "updated" (last activity) or "created" (newest submissions)
     """
-    return _gh.list_recent_prs(state, limit, sort)
+    return _github().list_recent_prs(state, limit, sort)
 
 
 @mcp.tool()
 def get_knowledge(filename: str | None = None) -> dict | str:
     """Load all knowledge base files, or a specific one by name."""
     if filename:
-        return _kb.load_file(filename)
-    return _kb.load_all()
+        return _knowledge().load_file(filename)
+    return _knowledge().load_all()
 
 
 @mcp.tool()
+@_threaded
 def save_review(pr_number: int, title: str, summary: str) -> str:
     """Save a review summary to the knowledge base."""
-    path = _kb.save_review(pr_number, title, summary)
+    path = _knowledge().save_review(pr_number, title, summary)
+    # Fingerprint the reviewed diff for find_similar_review; best effort, the
+    # review itself is saved either way
+    try:
+        diff = _served_diffs.get(pr_number)
+        sketch = diff_fingerprint(diff if diff is not None else _pr_diff(pr_number))
+        if sketch:  # no diff (fetch failed, or nothing changed): nothing to match on
+            _review_index().put(pr_number, title, sketch)
+    except Exception:
+        logger.warning("Could not index the review of PR #%d", pr_number, exc_info=True)
     return f"Review saved to {path}"
 
 
+@mcp.tool()
+@_threaded
+def find_similar_review(pr_number: int, threshold: float = 0.85) -> dict:
+    """Find a saved review of this PR's diff, or of a near-identical one.
+
+    Compares the PR's changed lines with those of every review stored by
+    save_review. On a match, build on that review instead of starting over.
+
+    Args:
+        pr_number: PR number
+        threshold: Minimum similarity (0-1) of the changed lines (default: 0.85)
+
+    Returns:
+        Dictionary with found (bool); on a match also pr_number, title,
+        similarity, and the saved review text
+    """
+    best = _review_index().most_similar(diff_fingerprint(_pr_diff(pr_number)))
+    if best is None or best[2] < threshold:
+        return {"found": False}
+    number, title, score = best
+    try:
+        review = _knowledge().load_file(f"reviews/pr-{number}.md")
+    except FileNotFoundError:
+        return {"found": False}
+    return {
+        "found": True,
+        "pr_number": number,
+        "title": title,
+        "similarity": round(score, 2),
+        "review": review,
+    }
+
+
 @mcp.tool()
 def add_knowledge(filename: str, content: str) -> str:
     """Add or update a knowledge base note (e.g., conventions, architecture)."""
-    path = _kb.add_note(filename, content)
+    path = _knowledge().add_note(filename, content)
     return f"Knowledge note saved to {path}"
 
 
 @mcp.tool()
+def clear_cache() -> str:
+    """Drop all cached GitHub data (PRs, files, listings, refs), including the on-disk file cache.
+
+    Use this when a PR or file changed on GitHub and tools still return the old version.
+    """
+    _fetch_pr.cache_clear()
+    _file_cache().clear()
+    _github().clear_cache()
+    return "Cache cleared"
+
+
+@mcp.tool()
+@_threaded
 def post_review_comment(pr_number: int, body: str, event: str = "COMMENT") -> dict:
     """Post a review comment on a PR. Event: APPROVE, REQUEST_CHANGES, or COMMENT."""
-    return _gh.post_review_comment(pr_number, body, event)
+    try:
+        return _github().post_review_comment(pr_number, body, event)
+    finally:
+        _pr_changed(pr_number)
 
 
 @mcp.tool()
+@_threaded
 def post_inline_comment(pr_number: int, path: str, line: int, body: str) -> dict:
     """Post a line-specific comment on a PR file.
 
@@ -91,11 +310,14 @@ def post_inline_comment(pr_number: int, path: str, line: int, body: str) -> dict
 
     Note: Posts a comment with formatted file:line reference.
     """
-    return _gh.post_inline_comment(pr_number, path, line, body)
+    try:
+        return _github().post_inline_comment(pr_number, path, line, body)
+    finally:
+        _pr_changed(pr_number)
 
 
 @mcp.tool()
-def parse_diff_for_review_lines(diff: str) -> list[dict]:
+def parse_diff_for_review_lines(diff: str, offset: int = 0, limit: int | None = None) -> list[dict]:
     """Parse a diff and extract lines suitable for inline comments.
 
     Returns list of dicts with path, line, content, and context for each added line.
@@ -103,14 +325,18 @@ def parse_diff_for_review_lines(diff: str) -> list[dict]:
 
     Args:
         diff: Unified diff text (from fetch_pr)
+        offset: Number of leading results to skip (default: 0)
+        limit: Maximum number of results (default: all). For very large diffs,
+            page through with offset += limit until fewer than limit come back.
 
     Returns:
         List of dicts with keys: path, line, content, context
     """
-    return _gh.parse_diff_for_review_lines(diff)
+    return _github().parse_diff_for_review_lines(diff, offset, limit)
 
 
 @mcp.tool()
+@_threaded
 def extract_imports_from_diff(pr_number: int, file_path: str | None = None) -> dict:
     """Extract import statements from changed lines in a PR diff.
 
@@ -121,11 +347,11 @@ def extract_imports_from_diff(pr_number: int, file_path: str | None = None) -> d
     Returns:
         Dictionary with imports_by_file containing added/removed imports and module names
     """
-    pr = _gh.fetch_pr(pr_number)
-    return _gh.extract_imports_from_diff(pr["diff"], file_path)
+    return _github().extract_imports_from_diff(_pr_diff(pr_number), file_path)
 
 
 @mcp.tool()
+@_threaded
 def fetch_file_context(path: str, line: int, context_lines: int = 20, ref: str = "main") -> dict:
     """Fetch surrounding context for a specific line in a file (not the whole file).
 
@@ -138,10 +364,11 @@ def fetch_file_context(path: str, line: int, context_lines: int = 20, ref: str =
     Returns:
         Dictionary with path, line, start_line, end_line, content, total_file_lines
     """
-    return _gh.fetch_file_context(path, line, context_lines, ref)
+    return _github().fetch_file_context(path, line, context_lines, ref)
 
 
 @mcp.tool()
+@_threaded
 def fetch_symbol_definition(symbol_name: str, search_paths: list[str] | None = None, ref: str = "main") -> dict:
     """Search for a symbol (function/class) definition in the codebase.
 
@@ -153,10 +380,11 @@ def fetch_symbol_definition(symbol_name: str, search_paths: list[str] | None = N
     Returns:
         Dictionary with symbol, found (bool), locations (list of path/line/context)
     """
-    return _gh.fetch_symbol_definition(symbol_name, search_paths, ref)
+    return _github().fetch_symbol_definition(symbol_name, search_paths, ref)
 
 
 @mcp.tool()
+@_threaded
 def check_related_config_files(pr_number: int) -> dict:
     """Identify configuration files that might be affected by PR changes.
 
@@ -166,28 +394,31 @@ def check_related_config_files(pr_number: int) -> dict:
     Returns:
         Dictionary with relevant_configs (list of path/reason/exists)
     """
-    pr = _gh.fetch_pr(pr_number)
-    changed_files = [f["filename"] for f in pr.get("files", [])]
-    return _gh.check_related_config_files(changed_files)
+    return _github().check_related_config_files(_pr_changed_files(pr_number))
 
 
 def _extract_section(markdown: str, heading: str) -> str:
-    """Extract content under a specific heading from markdown."""
-    lines = markdown.split("\n")
-    in_section = False
-    section_lines = []
+    """Extract content under a specific heading from markdown.
 
-    for line in lines:
-        if line.startswith("## ") and line[3:].strip() == heading:
-            in_section = True
-            continue
-        elif line.startswith("## ") and in_section:
-            # Hit next section, stop
-            break
-        elif in_section:
-            section_lines.append(line)
-
-    return "\n".join(section_lines).strip()
+    Hops from one "## " heading line to the next with str.find, so body
+    text is only sliced once, for the matching section.
+    """
+    if markdown.startswith("## "):
+        pos = 0
+    else:
+        pos = markdown.find("\n## ") + 1
+        if not pos:
+            return ""
+    while True:
+        eol = markdown.find("\n", pos)
+        if eol < 0:
+            eol = len(markdown)
+        nxt = markdown.find("\n## ", eol)
+        if markdown[pos + 3:eol].strip() == heading:
+            return markdown[eol:nxt if nxt >= 0 else None].strip()
+        if nxt < 0:
+            return ""
+        pos = nxt + 1
 
 
 @mcp.tool()
@@ -223,7 +454,7 @@ def get_pr_type_guidance(pr_title: str) -> dict:
 
     # Load type-specific guidance from knowledge base
     try:
-        guidance = _kb.load_file(f"pr-types/{primary_type}.md")
+        guidance = _knowledge().load_file(f"pr-types/{primary_type}.md")
     except FileNotFoundError:
         guidance = f"Type '{primary_type}' detected but guidance file not found. Use general guidelines."
 
@@ -236,18 +467,20 @@ def get_pr_type_guidance(pr_title: str) -> dict:
 
 
 @mcp.tool()
+@_threaded
 def post_review_with_inline_comments(
     pr_number: int,
     summary: str,
     inline_comments: list[dict],
     event: str = "COMMENT",
 ) -> dict:
-    """Post a review summary followed by inline comments one-by-one.
+    """Post a review summary together with its inline comments.
 
     This orchestrates the complete review posting workflow:
-    1. Posts the summary as a general review comment
-    2. Posts each inline comment sequentially
-    3. Continues posting even if individual comments fail
+    1. Submits the summary and all in-diff comments as one review
+    2. Posts comments on lines outside the diff as regular comments
+    3. Falls back to posting the summary, then the comments a few at a
+       time, if the single review can't be created, continuing past failures
     4. Returns detailed status for each operation
 
     Args:
@@ -259,16 +492,18 @@ def post_review_with_inline_comments(
     Returns:
         Dict with summary_posted, inline_comments list, successful/failed counts
     """
-    return _gh.post_review_with_inline_comments(pr_number, summary, inline_comments, event)
+    try:
+        return _github().post_review_with_inline_comments(pr_number, summary, inline_comments, event)
+    finally:
+        _pr_changed(pr_number)
 
 
 # -- Prompt template -----------------------------------------------------
 
 
-@mcp.prompt()
-def review_pr(pr_number: int) -> str:
-    """Review a vllm-omni PR with full context."""
-    return f"""Review PR #{pr_number} from vllm-project/vllm-omni.
+# Prompt bodies are static apart from the leading PR number, so only that
+# part is formatted per call
+_REVIEW_PR_PROMPT = """ from vllm-project/vllm-omni.
 
 **CRITICAL CONSTRAINTS:**
 - Summary MUST be 150-250 words maximum
@@ -294,7 +529,9 @@ Use direct language: "Missing tests for X" not "It would be beneficial to add te
 - If no type detected, use general review guidelines
 
 Steps:
-1. Call fetch_pr to get the PR diff, metadata, and discussion
+1. Call fetch_pr to get the PR diff, metadata, and discussion,
+   then call find_similar_review: if it finds a match, this diff was already reviewed -
+   start from that review, skip step 2, and only re-check what differs
 2. Call fetch_linked_refs to get context from referenced issues/PRs
 3. Call get_pr_type_guidance with the PR title to get type-specific review focus
 4. Call get_knowledge to load project conventions, architecture, and vllm-omni concepts
@@ -335,9 +572,13 @@ unique architecture and avoid over-engineering comments on example code."""
 
 
 @mcp.prompt()
-def review_pr_with_inline(pr_number: int) -> str:
-    """Review a PR with inline comments only (no summary)."""
-    return f"""Review PR #{pr_number} with inline comments workflow:
+def review_pr(pr_number: int) -> str:
+    """Review a vllm-omni PR with full context."""
+    return f"Review PR #{pr_number}{_REVIEW_PR_PROMPT}"
+
+
+# Same split as _REVIEW_PR_PROMPT
+_REVIEW_PR_INLINE_PROMPT = """ with inline comments workflow:
 
 **Critical Review Guidelines:**
 
@@ -499,7 +740,30 @@ def review_pr_with_inline(pr_number: int) -> str:
 """
 
 
+@mcp.prompt()
+def review_pr_with_inline(pr_number: int) -> str:
+    """Review a PR with inline comments only (no summary)."""
+    return f"Review PR #{pr_number}{_REVIEW_PR_INLINE_PROMPT}"
+
+
 # -- Entry point ---------------------------------------------------------
 
+
+def _warm_knowledge() -> None:
+    """Read the knowledge base into memory ahead of the first get_knowledge."""
+    try:
+        _knowledge().load_all()  # pr-types/ guidance included
+    except OSError:
+        pass  # the tools will surface it on first use
+
+
 if __name__ == "__main__":
+    # In the background, so the server answers the client handshake right away
+    threading.Thread(target=_warm_knowledge, name="warm-knowledge", daemon=True).start()
+    try:
+        import uvloop  # optional, from the "fast" extra
+    except ImportError:
+        pass
+    else:
+        uvloop.install()
     mcp.run()